@@ -0,0 +1,287 @@
+"""Agregados dos resultados gravados, mantidos de forma incremental.
+
+Contadores por questionário: categorias, soma das pontuações, histograma de
+respostas por pergunta e, nas pedras, cliques por cor. Os mesmos contadores
+(sem as respostas) existem por dia e por mês para consultas por período.
+Cada linha do banco é aplicada uma única vez: o checkpoint guarda os
+contadores e o maior id já lido, e a atualização lê só `id > ultimo_id`.
+O checkpoint guarda também o `criado` dessa linha; se ela sumiu ou mudou, o
+banco é outro (recriado ou trocado) e os contadores são refeitos do zero.
+Nos jogos, a atualização roda na thread de escrita de resultados após cada
+commit, e o checkpoint é regravado no máximo a cada CHECKPOINT_INTERVAL s.
+
+As consultas sobre o total não dependem do número de sessões; as por período
+percorrem os contadores por dia (ou mês), um por data com resultados.
+
+Uso:
+    python analise.py                                  # totais de todos os questionários
+    python analise.py --questionario Depressão --respostas
+    python analise.py --desde 2026-03-01 --ate 2026-03-31
+    python analise.py --json                           # resumo completo em JSON
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from resultados import DEFAULT_PATH, STORE, connect
+
+FORMAT = 2
+
+# Segundos mínimos entre regravações do checkpoint durante o jogo
+CHECKPOINT_INTERVAL = 5.0
+
+# Granularidades das janelas de tempo: nome -> formato de time.strftime
+WINDOWS = {'dia': '%Y-%m-%d', 'mes': '%Y-%m'}
+
+
+def window_of(*dates):
+    """Janela cujo formato todas as datas (as não nulas) seguem; ValueError se não há uma só."""
+    dates = [d for d in dates if d is not None]
+    for name, fmt in WINDOWS.items():
+        try:
+            for d in dates:
+                time.strptime(d, fmt)
+        except ValueError:
+            continue
+        return name
+    raise ValueError(f"datas {', '.join(dates)}: use todas AAAA-MM-DD ou todas AAAA-MM")
+
+
+def checkpoint_path(db_path):
+    return os.path.splitext(db_path)[0] + '_analise.json'
+
+
+def _counters():
+    return {'n': 0, 'soma': 0.0, 'categorias': {}}
+
+
+def _add(counters, score, category):
+    counters['n'] += 1
+    counters['soma'] += score
+    categories = counters['categorias']
+    categories[category] = categories.get(category, 0) + 1
+
+
+class Analytics:
+    """Contadores acumulados; apply() soma uma linha, update(db) lê as linhas novas."""
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        self.last_id = 0
+        # `criado` da linha last_id: identifica o banco de onde vieram os contadores
+        self.last_created = None
+        self.total = {}
+        self.windows = {name: {} for name in WINDOWS}
+        self._saved_at = 0.0
+
+    def apply(self, row_id, questionnaire, score, category, answers, clicks, created):
+        total = self.total.get(questionnaire)
+        if total is None:
+            total = self.total[questionnaire] = dict(_counters(), respostas=[], cliques={})
+        _add(total, score, category)
+        histograms = total['respostas']
+        for i, answer in enumerate(answers):
+            if i == len(histograms):
+                histograms.append({})
+            key = str(answer)
+            histograms[i][key] = histograms[i].get(key, 0) + 1
+        for color, count in (clicks or {}).items():
+            total['cliques'][color] = total['cliques'].get(color, 0) + count
+        stamp = time.localtime(created)
+        for name, fmt in WINDOWS.items():
+            bucket = self.windows[name].setdefault(time.strftime(fmt, stamp), {})
+            counters = bucket.get(questionnaire)
+            if counters is None:
+                counters = bucket[questionnaire] = _counters()
+            _add(counters, score, category)
+        if row_id > self.last_id:
+            self.last_id = row_id
+            self.last_created = created
+
+    def update(self, db):
+        """Aplica as linhas com id > last_id; devolve quantas eram novas."""
+        with self.lock:
+            if self.last_id:
+                mark = db.execute("SELECT criado FROM resultados WHERE id = ?", (self.last_id,)).fetchone()
+                if mark is None or mark[0] != self.last_created:
+                    # Banco recriado ou trocado: os contadores não valem mais
+                    self.reset()
+            rows = db.execute(
+                "SELECT id, questionario, pontuacao, categoria, respostas, cliques, criado "
+                "FROM resultados WHERE id > ? ORDER BY id", (self.last_id,))
+            n = 0
+            for row_id, questionnaire, score, category, answers, clicks, created in rows:
+                self.apply(row_id, questionnaire, score, category, json.loads(answers),
+                           json.loads(clicks) if clicks else None, created)
+                n += 1
+            return n
+
+    # --- checkpoint ---
+
+    def load(self, path):
+        """Carrega o checkpoint; devolve False (e começa do zero) se não existe ou é de outro formato."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('formato') != FORMAT:
+            return False
+        with self.lock:
+            self.last_id = data['ultimo_id']
+            self.last_created = data['ultimo_criado']
+            self.total = data['total']
+            self.windows = {name: data['janelas'].get(name, {}) for name in WINDOWS}
+        return True
+
+    def save(self, path):
+        with self.lock:
+            data = {'formato': FORMAT, 'ultimo_id': self.last_id, 'ultimo_criado': self.last_created,
+                    'total': self.total, 'janelas': self.windows}
+            text = json.dumps(data, ensure_ascii=False)
+        # Nome único: o jogo e a linha de comando podem gravar o mesmo checkpoint ao mesmo tempo
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.',
+                                   prefix=os.path.basename(path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            # Troca atômica: um leitor nunca vê o checkpoint pela metade
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self._saved_at = time.monotonic()
+
+    def listener(self, path):
+        """Callback para ResultStore.listeners: atualiza após cada commit e regrava o checkpoint."""
+        def on_commit(db, final):
+            if self.update(db) or final:
+                if final or time.monotonic() - self._saved_at >= CHECKPOINT_INTERVAL:
+                    self.save(path)
+        return on_commit
+
+    # --- consultas ---
+
+    def questionnaires(self):
+        return sorted(self.total)
+
+    def distribution(self, questionnaire, since=None, until=None):
+        """Contagem por categoria: total, ou somada nas janelas entre since e until (inclusive).
+
+        As datas são do dia (AAAA-MM-DD) ou do mês (AAAA-MM), as duas no mesmo formato.
+        """
+        if since is None and until is None:
+            with self.lock:
+                return dict(self.total.get(questionnaire, _counters())['categorias'])
+        window = window_of(since, until)
+        with self.lock:
+            result = {}
+            for key, bucket in self.windows[window].items():
+                if (since is None or key >= since) and (until is None or key <= until):
+                    for category, n in bucket.get(questionnaire, _counters())['categorias'].items():
+                        result[category] = result.get(category, 0) + n
+            return result
+
+    def mean_score(self, questionnaire):
+        with self.lock:
+            counters = self.total.get(questionnaire)
+            return counters['soma'] / counters['n'] if counters and counters['n'] else None
+
+    def answers(self, questionnaire):
+        """Por pergunta, {resposta: vezes}."""
+        with self.lock:
+            counters = self.total.get(questionnaire)
+            return [dict(h) for h in counters['respostas']] if counters else []
+
+    def clicks(self):
+        """Cliques por cor das pedras, somados sobre todos os participantes."""
+        with self.lock:
+            return self._clicks()
+
+    def _clicks(self):
+        result = {}
+        for counters in self.total.values():
+            for color, n in counters['cliques'].items():
+                result[color] = result.get(color, 0) + n
+        return result
+
+    def summary(self):
+        with self.lock:
+            return {
+                'ultimo_id': self.last_id,
+                'questionarios': {
+                    name: {'n': c['n'], 'media': c['soma'] / c['n'] if c['n'] else None,
+                           'categorias': dict(c['categorias'])}
+                    for name, c in sorted(self.total.items())
+                },
+                'cliques': self._clicks(),
+            }
+
+
+ANALYTICS = Analytics()
+
+
+def enable(store=STORE, analytics=ANALYTICS):
+    """Liga a atualização incremental ao banco aberto em `store` (chamar depois de abri-lo)."""
+    if not store.enabled:
+        return False
+    path = checkpoint_path(store.path)
+    analytics.load(path)
+    store.listeners.append(analytics.listener(path))
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Números agregados dos resultados gravados.")
+    parser.add_argument('--banco', default=os.environ.get('JOGOS_RESULTADOS', DEFAULT_PATH), help="arquivo SQLite")
+    parser.add_argument('--checkpoint', help="arquivo de checkpoint (padrão: <banco>_analise.json)")
+    parser.add_argument('--questionario', help="só este questionário")
+    parser.add_argument('--desde', help="início do período (AAAA-MM-DD ou AAAA-MM)")
+    parser.add_argument('--ate', help="fim do período, inclusive, no mesmo formato de --desde")
+    parser.add_argument('--respostas', action='store_true', help="histograma de respostas por pergunta")
+    parser.add_argument('--refazer', action='store_true', help="ignora o checkpoint e relê o banco inteiro")
+    parser.add_argument('--json', action='store_true', help="resumo completo em JSON")
+    args = parser.parse_args(argv)
+    try:
+        window_of(args.desde, args.ate)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    path = args.checkpoint or checkpoint_path(args.banco)
+    analytics = Analytics()
+    if not args.refazer:
+        analytics.load(path)
+    db = connect(args.banco)
+    if analytics.update(db):
+        analytics.save(path)
+    db.close()
+
+    if args.json:
+        print(json.dumps(analytics.summary(), ensure_ascii=False, indent=2))
+        return 0
+    names = [args.questionario] if args.questionario else analytics.questionnaires()
+    for name in names:
+        mean = analytics.mean_score(name)
+        counts = analytics.distribution(name, args.desde, args.ate)
+        print(f"{name}: {sum(counts.values())} resultado(s)"
+              + (f", média {mean:.2f}" if mean is not None and not (args.desde or args.ate) else ''))
+        for category, n in sorted(counts.items(), key=lambda item: -item[1]):
+            print(f"  {category:<22}{n:>6}")
+        if args.respostas:
+            for i, hist in enumerate(analytics.answers(name), 1):
+                print(f"  pergunta {i:>2}: " + '  '.join(f"{a}:{n}" for a, n in sorted(hist.items())))
+    clicks = analytics.clicks()
+    if clicks and not args.questionario:
+        print("cliques por cor: " + ', '.join(f"{color} {n}" for color, n in clicks.items()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
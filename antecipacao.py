@@ -0,0 +1,42 @@
+import time
+from collections import OrderedDict
+
+
+class Prefetcher:
+    """Trabalho adiantado: pedidos feitos agora, construídos nos quadros ociosos, usados depois."""
+    def __init__(self, max_size=8):
+        self.max_size = max_size
+        self._pending = OrderedDict()
+        self._ready = OrderedDict()
+
+    @property
+    def pending(self):
+        return bool(self._pending)
+
+    def request(self, key, build):
+        """Agenda build() para a chave, a menos que já esteja pronta ou na fila."""
+        if key not in self._ready and key not in self._pending:
+            self._pending[key] = build
+
+    def retain(self, keys):
+        """Descarta o que não é mais alcançável (pendente ou pronto)."""
+        keys = set(keys)
+        for queue in (self._pending, self._ready):
+            for key in [k for k in queue if k not in keys]:
+                del queue[key]
+
+    def step(self, budget_ms=8):
+        """Constrói itens da fila até esgotar o orçamento; devolve se ainda sobrou trabalho."""
+        start = time.perf_counter()
+        while self._pending:
+            key, build = self._pending.popitem(last=False)
+            self._ready[key] = build()
+            if len(self._ready) > self.max_size:
+                self._ready.popitem(last=False)
+            if (time.perf_counter() - start) * 1000 >= budget_ms:
+                break
+        return self.pending
+
+    def take(self, key):
+        """Entrega e remove o item pronto, ou None se ainda não foi construído."""
+        return self._ready.pop(key, None)
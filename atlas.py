@@ -0,0 +1,121 @@
+import pygame
+
+
+def button_key(size, color, radius, border_color=None, border_width=0):
+    """Nome, dentro do atlas, do fundo de botão com essas características."""
+    return ('button', tuple(size), tuple(color), radius,
+            tuple(border_color) if border_color else None, border_width)
+
+
+def button_sprite(size, color, radius, border_color=None, border_width=0):
+    """Fundo de botão arredondado rasterizado uma vez numa superfície transparente."""
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    rect = surf.get_rect()
+    pygame.draw.rect(surf, color, rect, border_radius=radius)
+    if border_color:
+        pygame.draw.rect(surf, border_color, rect, border_width, border_radius=radius)
+    return surf
+
+
+def _pack(sizes, max_width, padding):
+    """Empacotamento em prateleiras: ordena por altura e preenche linha a linha."""
+    order = sorted(sizes, key=lambda k: sizes[k][1], reverse=True)
+    rects = {}
+    x = y = shelf_h = width = 0
+    for key in order:
+        w, h = sizes[key]
+        if x and x + w > max_width:
+            y += shelf_h + padding
+            x = shelf_h = 0
+        rects[key] = pygame.Rect(x, y, w, h)
+        x += w + padding
+        shelf_h = max(shelf_h, h)
+        width = max(width, x - padding)
+    return rects, (max(width, 1), max(y + shelf_h, 1))
+
+
+class SpriteAtlas:
+    """Todas as imagens e fundos de botão numa única superfície, com índice de retângulos."""
+    def __init__(self, max_width=1024, padding=1):
+        self.max_width = max_width
+        self.padding = padding
+        # (superfície, retângulos) trocados juntos: uma thread pode reconstruir o atlas em uso
+        self.packed = (None, {})
+        self._sources = {}
+
+    @property
+    def surface(self):
+        return self.packed[0]
+
+    @property
+    def rects(self):
+        return self.packed[1]
+
+    def add(self, key, surf):
+        self._sources[key] = surf
+        return key
+
+    def add_button(self, size, color, radius, border_color=None, border_width=0):
+        key = button_key(size, color, radius, border_color, border_width)
+        if key not in self._sources:
+            self._sources[key] = button_sprite(size, color, radius, border_color, border_width)
+        return key
+
+    def build(self):
+        """Empacota tudo o que foi adicionado; exige display inicializado (convert_alpha)."""
+        sources = dict(self._sources)
+        sizes = {key: surf.get_size() for key, surf in sources.items()}
+        rects, size = _pack(sizes, self.max_width, self.padding)
+        atlas = pygame.Surface(size, pygame.SRCALPHA)
+        atlas.fill((0, 0, 0, 0))
+        for key, surf in sources.items():
+            # MAX sobre fundo zerado copia RGBA exato, sem mistura de alpha
+            atlas.blit(surf, rects[key], special_flags=pygame.BLEND_RGBA_MAX)
+        self.packed = (atlas.convert_alpha(), rects)
+        return self
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    def get_rect(self, key, **kwargs):
+        """Como Surface.get_rect: retângulo do sprite posicionado por center=, topleft=..."""
+        rect = pygame.Rect((0, 0), self.rects[key].size)
+        for attr, value in kwargs.items():
+            setattr(rect, attr, value)
+        return rect
+
+    def sprite(self, key):
+        """Subsuperfície do sprite dentro do atlas (compartilha os pixels, sem cópia)."""
+        surface, rects = self.packed
+        return surface.subsurface(rects[key])
+
+    def draw(self, target, key, dest):
+        surface, rects = self.packed
+        target.blit(surface, dest, rects[key])
+
+    def batch(self):
+        return SpriteBatch(self)
+
+
+class SpriteBatch:
+    """Acumula os desenhos de um quadro para um único Surface.blits()."""
+    def __init__(self, atlas):
+        self.atlas = atlas
+        self._items = []
+
+    def add(self, key, dest):
+        surface, rects = self.atlas.packed
+        self._items.append((surface, dest, rects[key]))
+
+    def add_surface(self, surf, dest):
+        """Superfícies fora do atlas (ex.: blocos de texto em cache) entram no mesmo lote."""
+        self._items.append((surf, dest))
+
+    def flush(self, target):
+        if self._items:
+            target.blits(self._items, doreturn=False)
+            self._items.clear()
+
+
+# Atlas compartilhado; cada jogo o preenche e constrói na inicialização
+ATLAS = SpriteAtlas()
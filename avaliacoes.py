@@ -0,0 +1,139 @@
+"""Definições dos questionários carregadas de avaliacoes.json, validadas e compiladas.
+
+A versão compilada fica em cache no disco e só é refeita quando o JSON muda.
+"""
+import json
+import os
+import pickle
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+DEFINITIONS_PATH = os.path.join(_HERE, 'avaliacoes.json')
+# Ao lado do JSON, não no diretório de onde o jogo foi iniciado
+COMPILED_CACHE = os.path.join(_HERE, '.asset_cache', 'avaliacoes.pickle')
+SUPPORTED_VERSIONS = (1,)
+# Muda quando o formato compilado muda, invalidando caches antigos
+COMPILED_FORMAT = 2
+
+
+class Assessment:
+    """Avaliação compilada: pontuação -> categoria por consulta direta a um vetor denso."""
+    def __init__(self, title, questions, categories, recommendations, option_values, default):
+        self.title = title
+        self.questions = questions
+        self.option_values = option_values
+        self.max_score = len(questions) * (option_values - 1)
+        self.names = [name for name, _, _ in categories]
+        if default not in self.names:
+            self.names.append(default)
+        self.default = self.names.index(default)
+        top = max([self.max_score] + [high for _, _, high in categories])
+        self.table = [self.default] * (top + 1)
+        # Ordem inversa: a primeira faixa listada prevalece em caso de sobreposição
+        for i, (_, low, high) in reversed(list(enumerate(categories))):
+            for score in range(max(low, 0), high + 1):
+                self.table[score] = i
+        self.recommendations = recommendations
+
+    def categorize(self, score):
+        if 0 <= score < len(self.table):
+            return self.names[self.table[score]]
+        return self.names[self.default]
+
+
+class StoneTest:
+    """Questionário das pedras: perguntas, opções e regra do resultado."""
+    def __init__(self, questions, options, scores, threshold, tips):
+        self.questions = questions
+        self.options = options
+        self.scores = scores
+        self.threshold = threshold
+        self.tips = tips
+
+    def score(self, answers):
+        """Média dos valores das opções escolhidas (índices), sobre todas as perguntas."""
+        return sum(self.scores[a] for a in answers) / len(self.questions)
+
+    def feedback(self, answers):
+        """Resultado a partir dos índices das opções escolhidas."""
+        return "Preocupante" if self.score(answers) >= self.threshold else "Não preocupante"
+
+
+class Definitions:
+    def __init__(self, version, assessments, stones):
+        self.version = version
+        self.assessments = assessments
+        self.stones = stones
+
+
+def _check(cond, msg):
+    if not cond:
+        raise ValueError(f"avaliacoes.json inválido: {msg}")
+
+
+def _is_text_list(value):
+    return isinstance(value, list) and value and all(isinstance(v, str) for v in value)
+
+
+def compile_definitions(data):
+    """Valida o conteúdo do JSON e devolve as definições compiladas."""
+    _check(data.get('version') in SUPPORTED_VERSIONS, f"versão {data.get('version')!r} não suportada")
+    default = data.get('default_category')
+    _check(isinstance(default, str), "default_category ausente")
+    assessments = []
+    for a in data.get('assessments', []):
+        title = a.get('title')
+        _check(isinstance(title, str), "avaliação sem título")
+        _check(_is_text_list(a.get('questions')), f"{title}: perguntas ausentes")
+        option_values = a.get('option_values')
+        _check(isinstance(option_values, int) and option_values > 1, f"{title}: option_values inválido")
+        categories = a.get('categories', [])
+        _check(categories, f"{title}: sem categorias")
+        for c in categories:
+            _check(len(c) == 3 and isinstance(c[0], str) and c[1] <= c[2], f"{title}: faixa inválida {c!r}")
+        names = {c[0] for c in categories} | {default}
+        recs = a.get('recommendations', {})
+        _check(set(recs) <= names, f"{title}: recomendação para categoria desconhecida")
+        _check(all(_is_text_list(v) for v in recs.values()), f"{title}: recomendações inválidas")
+        assessments.append(Assessment(
+            title, a['questions'], [tuple(c) for c in categories],
+            {k: '\n'.join(v) for k, v in recs.items()}, option_values, default
+        ))
+    _check(assessments, "nenhuma avaliação")
+    s = data.get('stones')
+    _check(isinstance(s, dict), "seção stones ausente")
+    _check(_is_text_list(s.get('questions')) and _is_text_list(s.get('options')), "stones: perguntas/opções")
+    _check(len(s.get('scores', [])) == len(s['options']), "stones: um valor por opção")
+    _check(isinstance(s.get('threshold'), (int, float)), "stones: threshold inválido")
+    stones = StoneTest(s['questions'], s['options'], s['scores'], s['threshold'], s.get('tips', []))
+    return Definitions(data['version'], assessments, stones)
+
+
+_loaded = {}
+
+
+def load_definitions(path=DEFINITIONS_PATH, cache_path=COMPILED_CACHE):
+    """Definições compiladas; usa o cache em disco se o JSON não mudou e memoriza no processo."""
+    st = os.stat(path)
+    stamp = (COMPILED_FORMAT, os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    cached = _loaded.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    defs = None
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_stamp, cached_defs = pickle.load(f)
+        if cached_stamp == stamp:
+            defs = cached_defs
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        pass
+    if defs is None:
+        with open(path, encoding='utf-8') as f:
+            defs = compile_definitions(json.load(f))
+        try:
+            os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump((stamp, defs), f)
+        except OSError:
+            pass
+    _loaded[path] = (stamp, defs)
+    return defs
@@ -0,0 +1,154 @@
+"""Camada de widgets em modo retido compartilhada pelos dois jogos.
+
+Cada widget guarda a própria superfície já renderizada e só a refaz quando o
+seu estado muda; as telas criam os widgets uma vez e os reaproveitam.
+"""
+import pygame
+
+from atlas import ATLAS, button_key
+from texto import TEXT_CACHE, layout_paragraphs
+
+TEXT_COLOR = (228, 241, 254)
+BUTTON_BG = (44, 62, 80)
+
+
+class Widget:
+    """Base: `rect` na tela e superfície em cache, refeita por render() após invalidate()."""
+    __slots__ = ('rect', '_surface')
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self._surface = None
+
+    @property
+    def surface(self):
+        if self._surface is None:
+            self._surface = self.render()
+        return self._surface
+
+    def prepare(self):
+        """Renderiza agora (por exemplo na pré-carga) em vez de no primeiro draw."""
+        return self.surface
+
+    def invalidate(self):
+        self._surface = None
+
+    def render(self):
+        raise NotImplementedError
+
+    def draw(self, target):
+        target.blit(self.surface, self.rect)
+
+    def add_to(self, batch):
+        batch.add_surface(self.surface, self.rect)
+
+    def hit(self, pos):
+        return self.rect.collidepoint(pos)
+
+
+class Label(Widget):
+    """Bloco de texto com quebra de linha; o canto superior esquerdo fica fixo."""
+    __slots__ = ('text', 'font', 'color', 'wrap_width', 'layout')
+
+    def __init__(self, text, font, pos, color=TEXT_COLOR, wrap_width=700, layout=layout_paragraphs):
+        super().__init__((pos, (0, 0)))
+        self.text = text
+        self.font = font
+        self.color = color
+        self.wrap_width = wrap_width
+        self.layout = layout
+
+    def set_text(self, text, surface=None):
+        """Troca o texto; `surface` é o bloco já renderizado, se alguém adiantou o trabalho."""
+        if text != self.text or surface is not None:
+            self.text = text
+            self._surface = surface
+            if surface is not None:
+                self.rect.size = surface.get_size()
+
+    def render(self):
+        surf = TEXT_CACHE.render(self.text, self.font, self.color, self.wrap_width, self.layout)
+        self.rect.size = surf.get_size()
+        return surf
+
+
+class Button(Widget):
+    """Fundo arredondado (do atlas, se empacotado) e rótulo compostos numa só superfície."""
+    __slots__ = ('text', 'callback', 'font', 'color', 'text_color', 'radius',
+                 'border_color', 'border_width', 'label_offset', 'background')
+
+    def __init__(self, rect, text, callback=None, font=None, color=BUTTON_BG, text_color=TEXT_COLOR,
+                 radius=5, border_color=None, border_width=0, label_offset=None):
+        super().__init__(rect)
+        self.text = text
+        self.callback = callback
+        self.font = font
+        self.color = color
+        self.text_color = text_color
+        self.radius = radius
+        self.border_color = border_color
+        self.border_width = border_width
+        # None centraliza o rótulo; (dx, dy) o posiciona a partir do canto do botão
+        self.label_offset = label_offset
+        self.background = button_key(self.rect.size, color, radius, border_color, border_width)
+
+    def set_text(self, text):
+        if text != self.text:
+            self.text = text
+            self.invalidate()
+
+    def render(self):
+        surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 0))
+        if self.background in ATLAS:
+            atlas, rects = ATLAS.packed
+            surf.blit(atlas, (0, 0), rects[self.background], special_flags=pygame.BLEND_RGBA_MAX)
+        else:
+            local = surf.get_rect()
+            pygame.draw.rect(surf, self.color, local, border_radius=self.radius)
+            if self.border_color:
+                pygame.draw.rect(surf, self.border_color, local, self.border_width, border_radius=self.radius)
+        txt = TEXT_CACHE.line(self.text, self.font, self.text_color)
+        if self.label_offset is None:
+            surf.blit(txt, txt.get_rect(center=surf.get_rect().center))
+        else:
+            surf.blit(txt, self.label_offset)
+        return surf
+
+
+class Stone(Widget):
+    """Pedra do atlas com o rótulo da opção à direita; `rect` é o do sprite.
+
+    `key` é também o nome da cor; `index` é a posição da opção nas definições.
+    O clique é testado contra a máscara do sprite, pixel a pixel.
+    """
+    __slots__ = ('key', 'index', 'sprite', 'mask', 'label')
+
+    def __init__(self, key, center, index, label):
+        super().__init__(ATLAS.get_rect(key, center=center))
+        self.key = key
+        self.index = index
+        self.sprite = ATLAS.sprite(key)
+        self.mask = pygame.mask.from_surface(self.sprite)
+        self.label = label
+
+    @property
+    def color_name(self):
+        return self.key
+
+    def render(self):
+        return self.label.surface
+
+    def draw(self, target):
+        ATLAS.draw(target, self.key, self.rect)
+        self.label.draw(target)
+
+    def add_to(self, batch):
+        batch.add(self.key, self.rect)
+        self.label.add_to(batch)
+
+    def hit(self, pos):
+        # Retângulo primeiro; a máscara só é consultada dentro dele
+        x = pos[0] - self.rect.x
+        y = pos[1] - self.rect.y
+        return 0 <= x < self.rect.w and 0 <= y < self.rect.h and bool(self.mask.get_at((x, y)))
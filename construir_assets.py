@@ -0,0 +1,39 @@
+"""Etapa de build: grava no cache de assets as imagens dos jogos já redimensionadas.
+
+Uso: python construir_assets.py
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from recursos import GAME_IMAGES, ImageCache, _decode
+
+
+def build(cache, images=GAME_IMAGES):
+    """Gera as entradas que faltam ou cujo PNG mudou; devolve quantas foram geradas."""
+    built = 0
+    for path, size, smooth in images:
+        if cache.is_fresh(path, size, smooth):
+            continue
+        cache.store(path, size, smooth, _decode(path, size, smooth))
+        built += 1
+    return built
+
+
+def main():
+    pygame.display.init()
+    # convert_alpha precisa de uma janela, mesmo que invisível
+    pygame.display.set_mode((1, 1))
+    cache = ImageCache()
+    built = build(cache)
+    cache.save()
+    removed = cache.prune()
+    print(f"{built} imagem(ns) gerada(s), {len(GAME_IMAGES) - built} em dia, "
+          f"{removed} arquivo(s) obsoleto(s) removido(s) em {cache.cache_dir}/")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
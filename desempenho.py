@@ -0,0 +1,301 @@
+"""Benchmarks sem janela (SDL_VIDEODRIVER=dummy) dos caminhos de desenho e de entrada.
+
+Uso:
+    python desempenho.py                          # grava desempenho.json
+    python desempenho.py --repeat 500 --filtro quadro
+    python desempenho.py --saida novo.json --comparar desempenho_base.json
+
+Com --comparar, cada benchmark presente nos dois arquivos é comparado pela
+mediana; o código de saída é 1 se algum ficou mais lento que a tolerância.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+BENCHMARKS = []
+
+
+def bench(name):
+    """Registra setup(ctx) -> função sem argumentos que será cronometrada."""
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+class Context:
+    """Janela, jogos e definições compartilhados pelos benchmarks."""
+    def __init__(self):
+        import parte2_oficial
+        import pedras_teste
+        self.p2 = parte2_oficial
+        self.pt = pedras_teste
+        self.screen = parte2_oficial.startup()
+        pedras_teste.build_atlas()
+        pedras_teste.build_game_atlas()
+        self.defs = parte2_oficial.load_definitions()
+        self.font = parte2_oficial.FONT
+        self.font_pt = parte2_oficial.FONTS.get('Arial', 22)
+
+
+# --- texto ---
+
+@bench('texto/draw_wrapped_text_parte2')
+def _(ctx):
+    text = ctx.defs.assessments[0].questions[0]
+    return lambda: ctx.p2.draw_wrapped_text(ctx.screen, text, 50, 80, ctx.font)
+
+
+@bench('texto/draw_wrapped_text_pedras')
+def _(ctx):
+    text = ctx.defs.stones.questions[0]
+    return lambda: ctx.pt.draw_wrapped_text(ctx.screen, text, 20, 20, ctx.font_pt)
+
+
+# Os dois acima são acertos do TEXT_CACHE depois do aquecimento; estes refazem a quebra e o bloco
+
+@bench('texto/draw_wrapped_text_parte2_sem_cache')
+def _(ctx):
+    from texto import TEXT_CACHE, layout_paragraphs
+    text = ctx.defs.assessments[0].questions[0]
+
+    def draw():
+        layout = layout_paragraphs(text, ctx.font, 700)
+        ctx.screen.blit(TEXT_CACHE._build(layout, ctx.font, ctx.p2.TEXT_COLOR), (50, 80))
+    return draw
+
+
+@bench('texto/draw_wrapped_text_pedras_sem_cache')
+def _(ctx):
+    from texto import TEXT_CACHE, layout_words
+    text = ctx.defs.stones.questions[0]
+
+    def draw():
+        layout = layout_words(text, ctx.font_pt, 500)
+        ctx.screen.blit(TEXT_CACHE._build(layout, ctx.font_pt, ctx.pt.TEXT_COLOR), (20, 20))
+    return draw
+
+
+@bench('texto/bloco_sem_cache')
+def _(ctx):
+    from texto import TEXT_CACHE, layout_paragraphs
+    text = ctx.defs.assessments[0].recommendations[ctx.defs.assessments[0].names[0]]
+    return lambda: TEXT_CACHE._build(layout_paragraphs(text, ctx.font, 700),
+                                     ctx.font, (228, 241, 254))
+
+
+@bench('texto/font_render')
+def _(ctx):
+    text = ctx.defs.assessments[0].questions[0]
+    return lambda: ctx.font.render(text, True, (228, 241, 254))
+
+
+# --- imagens ---
+
+@bench('imagem/load_image_parte2')
+def _(ctx):
+    return lambda: ctx.p2.load_image('bruxo.png', size=(180, 250))
+
+
+@bench('imagem/load_image_pedras')
+def _(ctx):
+    return lambda: ctx.pt.load_image('pedra_verde.png', (60, 60))
+
+
+# --- widgets ---
+
+@bench('widget/button_draw')
+def _(ctx):
+    btn = ctx.p2.Button((100, 500, 80, 40), '3', font=ctx.font)
+    return lambda: btn.draw(ctx.screen)
+
+
+@bench('widget/button_render')
+def _(ctx):
+    btn = ctx.p2.Button((100, 500, 80, 40), '3', font=ctx.font)
+    return btn.render
+
+
+# --- quadros completos ---
+
+def _frame(phase):
+    def draw():
+        phase.invalidate()
+        phase.draw()
+    return draw
+
+
+@bench('quadro/AssessmentPhase')
+def _(ctx):
+    manager = ctx.p2.PhaseManager(ctx.screen)
+    manager.start()
+    return _frame(manager.phase)
+
+
+@bench('quadro/ResultPhase')
+def _(ctx):
+    a = ctx.defs.assessments[0]
+    category = a.names[0]
+    return _frame(ctx.p2.ResultPhase(ctx.screen, f"{a.title}: {category}", a.recommendations[category]))
+
+
+@bench('quadro/ResultPhase_preparada')
+def _(ctx):
+    a = ctx.defs.assessments[0]
+    category = a.names[0]
+    title = f"{a.title}: {category}"
+    prepared = ctx.p2.ResultPhase.prerender(ctx.screen, title, a.recommendations[category])
+    return _frame(ctx.p2.ResultPhase(ctx.screen, title, a.recommendations[category], prepared))
+
+
+@bench('quadro/ThankYouPhase')
+def _(ctx):
+    return _frame(ctx.p2.ThankYouPhase(ctx.screen))
+
+
+@bench('quadro/pedras')
+def _(ctx):
+    stones_def = ctx.defs.stones
+    colors = dict(zip(stones_def.options, ctx.pt.option_color_list))
+    stones = ctx.pt.create_stones(ctx.screen, ctx.font_pt, colors)
+    question = ctx.pt.wrapped_label(stones_def.questions[0], ctx.font_pt, (20, 20))
+    batch = ctx.pt.ATLAS.batch()
+    return lambda: ctx.pt.draw_stone_screen(ctx.screen, batch, question, stones)
+
+
+@bench('quadro/transicao')
+def _(ctx):
+    from transicao import Transition
+    transition = Transition(ctx.screen, duration=400)
+
+    def step():
+        transition.start(now=0)
+        transition.apply(now=200)
+    return step
+
+
+# --- entrada ---
+
+@bench('entrada/clique_opcao')
+def _(ctx):
+    from eventos import EventRouter
+    router = EventRouter(filter_queue=False)
+    manager = ctx.p2.PhaseManager(ctx.screen)
+    manager.start()
+    manager.phase.bind(router)
+    # Clique fora dos botões: mede só a resolução, sem avançar a pergunta
+    event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(95, 510), button=1)
+    return lambda: router.dispatch(event)
+
+
+@bench('entrada/clique_pedra')
+def _(ctx):
+    from eventos import EventRouter
+    router = EventRouter(filter_queue=False)
+    colors = dict(zip(ctx.defs.stones.options, ctx.pt.option_color_list))
+    for stone in ctx.pt.create_stones(ctx.screen, ctx.font_pt, colors):
+        router.on_click(stone, lambda: None)
+    event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(300, 350), button=1)
+    return lambda: router.dispatch(event)
+
+
+def measure(fn, repeat, warmup):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+    ms = [s / 1e6 for s in samples]
+    return {
+        'median_ms': statistics.median(ms),
+        'p95_ms': ms[min(len(ms) - 1, int(len(ms) * 0.95))],
+        'mean_ms': statistics.fmean(ms),
+        'min_ms': ms[0],
+        'n': len(ms),
+    }
+
+
+def run(repeat=200, warmup=20, name_filter=None):
+    ctx = Context()
+    results = {}
+    for name, setup in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(setup(ctx), repeat, warmup)
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'sdl': '.'.join(map(str, pygame.get_sdl_version())),
+            'driver': os.environ.get('SDL_VIDEODRIVER'),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, tolerance=0.25, min_delta_ms=0.01):
+    """Linhas (nome, base, atual, razão, situação) para os benchmarks dos dois lados."""
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        old, new = base['median_ms'], result['median_ms']
+        ratio = new / old if old else float('inf')
+        if ratio > 1 + tolerance and new - old > min_delta_ms:
+            status = 'REGRESSÃO'
+        elif ratio < 1 - tolerance and old - new > min_delta_ms:
+            status = 'melhora'
+        else:
+            status = 'igual'
+        rows.append((name, old, new, ratio, status))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de desenho e entrada sem janela.")
+    parser.add_argument('--saida', default='desempenho.json', help="arquivo JSON de resultados")
+    parser.add_argument('--repeat', type=int, default=200, help="medições por benchmark")
+    parser.add_argument('--warmup', type=int, default=20, help="execuções descartadas antes")
+    parser.add_argument('--filtro', help="roda só benchmarks cujo nome contém este texto")
+    parser.add_argument('--comparar', metavar='BASE', help="JSON de referência para detectar regressões")
+    parser.add_argument('--tolerancia', type=float, default=0.25, help="piora relativa aceita (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    report = run(args.repeat, args.warmup, args.filtro)
+    pygame.quit()
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"{'benchmark':<40}{'mediana':>10}{'p95':>10}  (ms)")
+    for name, r in report['results'].items():
+        print(f"{name:<40}{r['median_ms']:>10.4f}{r['p95_ms']:>10.4f}")
+    print(f"resultados em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.tolerancia)
+        print(f"\n{'benchmark':<40}{'base':>10}{'atual':>10}{'razão':>8}  situação")
+        for name, old, new, ratio, status in rows:
+            print(f"{name:<40}{old:>10.4f}{new:>10.4f}{ratio:>8.2f}  {status}")
+        if any(status == 'REGRESSÃO' for *_, status in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Roteamento de eventos: tabela por tipo, índice espacial para cliques e filtro da fila do SDL.
+
+Cada tela registra só o que trata; commit() libera na fila do SDL apenas esses
+tipos (mais os de janela e QUIT), então MOUSEMOTION e afins nem chegam a ser
+enfileirados quando ninguém os escuta.
+"""
+import time
+
+import pygame
+
+# Sempre liberados: saída e eventos de janela usados pelo FrameScheduler e pela repintura
+ALWAYS_ALLOWED = (
+    pygame.QUIT,
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWFOCUSGAINED,
+    pygame.WINDOWFOCUSLOST,
+    pygame.WINDOWMINIMIZED,
+    pygame.WINDOWRESTORED,
+    pygame.WINDOWMAXIMIZED,
+)
+
+
+class SpatialIndex:
+    """Grade uniforme: cada célula lista os itens cujo retângulo a toca."""
+    def __init__(self, cell=64):
+        self.cell = cell
+        self._cells = {}
+        self.size = 0
+
+    def insert(self, rect, item):
+        c = self.cell
+        for cx in range(rect.left // c, (rect.right - 1) // c + 1):
+            for cy in range(rect.top // c, (rect.bottom - 1) // c + 1):
+                self._cells.setdefault((cx, cy), []).append(item)
+        self.size += 1
+
+    def query(self, pos):
+        """Itens cuja célula contém pos, na ordem de inserção (o último fica por cima)."""
+        return self._cells.get((pos[0] // self.cell, pos[1] // self.cell), ())
+
+    def clear(self):
+        self._cells.clear()
+        self.size = 0
+
+
+class EventRouter:
+    """Despacho por tipo de evento; as rotas da tela atual são trocadas a cada tela."""
+    def __init__(self, filter_queue=True):
+        self.filter_queue = filter_queue
+        self._handlers = {}
+        self._keys = {}
+        self._clicks = SpatialIndex()
+        # observer(event, alvo, início em ms) após cada clique ou tecla tratados
+        self.observer = None
+
+    def on(self, event_type, handler):
+        """handler(event) para todo evento do tipo."""
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def on_key(self, key, handler):
+        """handler() quando a tecla é pressionada."""
+        self._keys[key] = handler
+
+    def on_click(self, widget, handler):
+        """handler() num clique que acerta widget.hit(pos) dentro de widget.rect."""
+        self._clicks.insert(widget.rect, (widget, handler))
+
+    def clear(self):
+        """Descarta as rotas da tela anterior."""
+        self._handlers.clear()
+        self._keys.clear()
+        self._clicks.clear()
+
+    def subscribed(self):
+        types = set(ALWAYS_ALLOWED) | set(self._handlers)
+        if self._keys:
+            types.add(pygame.KEYDOWN)
+        if self._clicks.size:
+            types.add(pygame.MOUSEBUTTONDOWN)
+        return types
+
+    def commit(self):
+        """Restringe a fila do SDL aos tipos assinados; chamar na thread principal."""
+        if not self.filter_queue:
+            return
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(sorted(self.subscribed()))
+
+    def dispatch(self, event):
+        """Entrega o evento às rotas do seu tipo; devolve se alguém o tratou."""
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            for widget, handler in reversed(self._clicks.query(event.pos)):
+                if widget.hit(event.pos):
+                    self._run(handler, event, widget)
+                    return True
+        elif event.type == pygame.KEYDOWN:
+            handler = self._keys.get(event.key)
+            if handler is not None:
+                self._run(handler, event, event.key)
+                return True
+        handlers = self._handlers.get(event.type)
+        if not handlers:
+            return False
+        for handler in handlers:
+            handler(event)
+        return True
+
+    def _run(self, handler, event, target):
+        if self.observer is None:
+            handler()
+            return
+        start = time.perf_counter() * 1000
+        handler()
+        self.observer(event, target, start)
+
+
+ROUTER = EventRouter()
@@ -0,0 +1,215 @@
+"""Gravação e reprodução de sessões: a fila de eventos de main(), com o instante de cada leva.
+
+O arquivo é JSON por linha comprimido com gzip: um cabeçalho e depois uma linha
+[ms desde o início, [[tipo, atributos], ...]] para cada quadro que recebeu eventos.
+Na reprodução o tempo é o de um ritmo.VirtualClock: cada quadro avança 1/fps,
+quadros ociosos saltam direto para a próxima leva gravada, e as transições
+leem esse mesmo relógio. Sem ritmo (modo benchmark), a sessão roda tão rápido
+quanto a CPU permitir.
+
+Ativação nos jogos: JOGOS_GRAVAR=<arquivo> grava; JOGOS_REPRODUZIR=<arquivo> reproduz
+no ritmo gravado.
+
+Uso:
+    python gravacao.py sessao.jsonl.gz              # reproduz sem ritmo e mede
+    python gravacao.py sessao.jsonl.gz --ritmo      # reproduz no tempo gravado
+"""
+import argparse
+import atexit
+import gzip
+import importlib
+import json
+import os
+import sys
+import time
+
+import pygame
+
+import ritmo
+from ritmo import FrameScheduler, VirtualClock
+
+FORMAT = 1
+
+# Atributos gravados: o resto (objetos de janela etc.) não volta igual na reprodução
+_PLAIN = (int, float, str, bool, type(None))
+
+# Scheduler criado por scheduler_from_env() na execução atual
+SESSION = None
+
+
+def encode(event):
+    attrs = {}
+    for name, value in event.__dict__.items():
+        if isinstance(value, tuple) and all(isinstance(v, _PLAIN) for v in value):
+            attrs[name] = list(value)
+        elif isinstance(value, _PLAIN):
+            attrs[name] = value
+    return [event.type, attrs]
+
+
+def decode(item):
+    event_type, attrs = item
+    return pygame.event.Event(event_type, {
+        name: tuple(value) if isinstance(value, list) else value for name, value in attrs.items()
+    })
+
+
+def read(path):
+    """Cabeçalho e lista de (ms, [eventos]) de um arquivo gravado."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get('formato') != FORMAT:
+            raise ValueError(f"{path}: formato de gravação {header.get('formato')} desconhecido")
+        batches = [(ms, [decode(item) for item in items]) for ms, items in map(json.loads, f)]
+    return header, batches
+
+
+class RecordingScheduler(FrameScheduler):
+    """FrameScheduler que grava cada leva de eventos; o arquivo é fechado ao sair."""
+    def __init__(self, path, game, fps=30, **kwargs):
+        super().__init__(fps, **kwargs)
+        self.path = path
+        self.start = self.at
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        header = {'formato': FORMAT, 'jogo': game, 'fps': fps,
+                  'data': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        self._file.write(json.dumps(header) + '\n')
+        atexit.register(self.close)
+
+    def events(self):
+        events = super().events()
+        # O que chega durante a carga é descartado pelo jogo; na reprodução a carga não tem quadros
+        if events and not self.loading and self._file is not None:
+            line = [round(self.at - self.start, 1), [encode(e) for e in events]]
+            self._file.write(json.dumps(line, separators=(',', ':')) + '\n')
+        return events
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ReplayScheduler(FrameScheduler):
+    """Entrega as levas gravadas no relógio virtual; paced=False dispensa a espera real."""
+    def __init__(self, batches, fps=30, paced=True, **kwargs):
+        self.clock_v = VirtualClock()
+        ritmo.use_clock(self.clock_v)
+        super().__init__(fps, **kwargs)
+        self.virtual = True
+        self.batches = batches
+        self.paced = paced
+        self.next = 0
+        self.frame_count = 0
+        self.work_ms = 0.0
+        self._returned = None
+        self._wall = time.perf_counter()
+
+    @property
+    def finished(self):
+        return self.next >= len(self.batches)
+
+    def events(self):
+        now = time.perf_counter()
+        if self._returned is not None:
+            # Tempo gasto pelo jogo desde a última leva: desenho, flip e handlers
+            self.work_ms += (now - self._returned) * 1000
+        self.frame_count += 1
+        self.frames[self.state] += 1
+        step = 1000 / self.fps
+        if self.state == ritmo.ACTIVE or self.finished:
+            self.clock_v.advance(step)
+        else:
+            # Ocioso: nada se move na tela até a próxima entrada
+            self.clock_v.now = max(self.clock_v.now + step, self.batches[self.next][0])
+        if self.paced:
+            delay = self.clock_v.now / 1000 - (time.perf_counter() - self._wall)
+            if delay > 0:
+                time.sleep(delay)
+        # A fila real é descartada: só o que foi gravado chega ao jogo
+        events = [e for e in pygame.event.get() if e.type == pygame.QUIT]
+        if self.finished:
+            events.append(pygame.event.Event(pygame.QUIT))
+        elif self.batches[self.next][0] <= self.clock_v.now:
+            events.extend(self.batches[self.next][1])
+            self.next += 1
+        for event in events:
+            self._track(event)
+        if events:
+            self.keep_active()
+        self.since = self.at = time.perf_counter() * 1000
+        self._returned = time.perf_counter()
+        return events
+
+    def close(self):
+        ritmo.use_clock(None)
+
+    def stats(self):
+        return {
+            'quadros': self.frame_count,
+            'levas': self.next,
+            'render_ms': self.work_ms,
+            'tempo_virtual_ms': self.clock_v.now,
+        }
+
+
+def scheduler_from_env(fps, game):
+    """FrameScheduler de main(): gravando, reproduzindo ou normal, conforme o ambiente."""
+    global SESSION
+    replay = os.environ.get('JOGOS_REPRODUZIR')
+    record = os.environ.get('JOGOS_GRAVAR')
+    if replay:
+        header, batches = read(replay)
+        SESSION = ReplayScheduler(batches, fps=header.get('fps', fps),
+                                  paced=os.environ.get('JOGOS_SEM_RITMO') != '1')
+    elif record:
+        SESSION = RecordingScheduler(record, game, fps)
+    else:
+        SESSION = FrameScheduler(fps)
+    return SESSION
+
+
+def replay(path, paced=False):
+    """Roda o main() do jogo gravado em `path`; devolve estatísticas e resultados da sessão."""
+    header, _ = read(path)
+    os.environ['JOGOS_REPRODUZIR'] = path
+    os.environ['JOGOS_SEM_RITMO'] = '0' if paced else '1'
+    os.environ.pop('JOGOS_GRAVAR', None)
+    # Sessões reproduzidas não são de participantes: nada vai para o banco de resultados
+    os.environ['JOGOS_RESULTADOS'] = '0'
+    module = importlib.import_module(header['jogo'])
+    start = time.perf_counter()
+    try:
+        module.main()
+    except SystemExit:
+        pass
+    wall_ms = (time.perf_counter() - start) * 1000
+    SESSION.close()
+    stats = SESSION.stats()
+    stats['total_ms'] = wall_ms
+    return {'jogo': header['jogo'], 'estatisticas': stats, 'resultados': module.session_results()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduz uma sessão gravada e mede o desempenho.")
+    parser.add_argument('arquivo', help="sessão gravada com JOGOS_GRAVAR=<arquivo>")
+    parser.add_argument('--ritmo', action='store_true', help="respeita o tempo gravado em vez de correr")
+    args = parser.parse_args(argv)
+
+    if not args.ritmo:
+        # Medição sem janela; com --ritmo a sessão é para ser vista
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    report = replay(args.arquivo, paced=args.ritmo)
+    stats = report['estatisticas']
+    print(f"jogo: {report['jogo']}")
+    print(f"quadros: {stats['quadros']}  levas: {stats['levas']}")
+    print(f"render: {stats['render_ms']:.1f} ms ({stats['render_ms'] / max(stats['quadros'], 1):.3f} ms/quadro)"
+          f"  total: {stats['total_ms']:.1f} ms  tempo virtual: {stats['tempo_virtual_ms'] / 1000:.1f} s")
+    print(f"resultados: {json.dumps(report['resultados'], ensure_ascii=False)}")
+    return 0
+
+
+if __name__ == '__main__':
+    # Os jogos importam `gravacao`; rodar por ele faz SESSION ser a mesma que eles preenchem
+    import gravacao
+    sys.exit(gravacao.main())
@@ -0,0 +1,79 @@
+"""Inicialização seletiva do SDL e medição do tempo até o primeiro quadro.
+
+Com JOGOS_TTFF=1 o tempo é impresso no stderr; com JOGOS_TTFF=<arquivo.csv>
+uma linha é acrescentada ao arquivo a cada execução.
+"""
+import os
+import sys
+import time
+
+
+def _process_age():
+    """Segundos desde a criação do processo (Linux), incluindo a partida do interpretador."""
+    try:
+        with open('/proc/self/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        # Campo 22 de /proc/self/stat: início do processo em ticks desde o boot
+        return max(uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK'), 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+START = time.perf_counter() - _process_age()
+
+import pygame  # noqa: E402  (depois de START para contar o import do pygame)
+
+
+class StartupTimer:
+    """Marcos da inicialização em ms desde o início do processo."""
+    def __init__(self, start=START):
+        self.start = start
+        self.marks = []
+        self.first_frame = None
+
+    def elapsed(self):
+        return (time.perf_counter() - self.start) * 1000
+
+    def mark(self, label):
+        self.marks.append((label, self.elapsed()))
+
+    def first_frame_shown(self):
+        """Chamado depois de cada flip da tela inicial; só o primeiro conta."""
+        if self.first_frame is not None:
+            return
+        self.first_frame = self.elapsed()
+        target = os.environ.get('JOGOS_TTFF')
+        if target:
+            self._report(target)
+
+    def summary(self):
+        marks = ', '.join(f"{label} {ms:.0f}" for label, ms in self.marks)
+        return f"primeiro quadro em {self.first_frame:.0f} ms ({marks})"
+
+    def _report(self, target):
+        if target == '1':
+            print(self.summary(), file=sys.stderr)
+            return
+        script = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else '?'
+        marks = ';'.join(f"{label}={ms:.1f}" for label, ms in self.marks)
+        try:
+            with open(target, 'a', encoding='utf-8') as f:
+                f.write(f"{time.strftime('%Y-%m-%dT%H:%M:%S')},{script},{self.first_frame:.1f},{marks}\n")
+        except OSError as exc:
+            print(f"JOGOS_TTFF: não foi possível gravar em {target}: {exc}", file=sys.stderr)
+
+
+TIMER = StartupTimer()
+
+
+def init_pygame(size, caption):
+    """Inicia só display e fonte (sem mixer, joystick etc.) e abre a janela."""
+    TIMER.mark('import')
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption(caption)
+    TIMER.mark('janela')
+    return screen
@@ -0,0 +1,187 @@
+"""Latência entre a entrada e a tela: do evento até o primeiro flip que mostra a resposta.
+
+Cada clique ou tecla tratado pelo roteador vira um registro com quatro instantes:
+a janela de chegada do evento (o pygame não expõe o timestamp do SDL, então
+vale o intervalo dado pelo FrameScheduler: o evento chegou entre `since` e
+`at`, o momento em que saiu da fila), o início e o fim do handler, e o fim do
+flip/update seguinte. As contagens são agrupadas por fase e por tipo de
+interação (botao, pedra, tecla).
+
+Ativação: JOGOS_LATENCIA=1 imprime o relatório ao sair;
+JOGOS_LATENCIA=<arquivo.json> grava os registros e os histogramas.
+
+Uso:
+    python latencia.py latencia.json          # relatório de um arquivo gravado
+"""
+import argparse
+import atexit
+import collections
+import json
+import os
+import time
+
+import pygame
+
+from eventos import ROUTER
+from perfil import percentile
+
+# Limites superiores (ms) das faixas do histograma; a última é aberta
+BUCKETS = (8, 16, 33, 50, 100, 200)
+
+# Tipo de interação pelo alvo do clique; teclas viram 'tecla'
+KINDS = {'Button': 'botao', 'Stone': 'pedra'}
+
+# Campos de cada registro, em ms: fila (pior caso), handler, até o flip (medido e pior caso)
+FIELDS = ('fila_max', 'handler', 'total', 'total_max')
+
+
+def histogram(values, buckets=BUCKETS):
+    counts = [0] * (len(buckets) + 1)
+    for v in values:
+        i = 0
+        while i < len(buckets) and v > buckets[i]:
+            i += 1
+        counts[i] += 1
+    return counts
+
+
+def bucket_labels(buckets=BUCKETS):
+    return [f"≤{b}" for b in buckets] + [f">{buckets[-1]}"]
+
+
+class LatencyTracer:
+    """Registros (fila_max, handler, total, total_max) por (fase, tipo), nos buffers circulares."""
+    def __init__(self, size=512):
+        self.size = size
+        self.enabled = False
+        self.records = {}
+        self._router = None
+        self._phase = None
+        self._window = None
+        self._pending = []
+
+    def enable(self, router=ROUTER):
+        """Passa a observar os cliques e teclas tratados por `router`."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._router = router
+        router.observer = self.handled
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._router.observer = None
+        self._pending.clear()
+
+    def received(self, scheduler, phase):
+        """Chamado logo após scheduler.events(): eventos desta leva pertencem à fase `phase`."""
+        if not self.enabled:
+            return
+        self._phase = phase
+        self._window = (scheduler.since, scheduler.at)
+
+    def handled(self, event, target, start):
+        """Observer do roteador: o handler de `event` rodou de `start` até agora."""
+        if self._window is None:
+            # Telas fora do loop principal (boas-vindas, carregamento) não são medidas
+            return
+        kind = 'tecla' if event.type == pygame.KEYDOWN else KINDS.get(type(target).__name__, 'outro')
+        since, at = self._window
+        self._pending.append((self._phase, kind, since, at, start, time.perf_counter() * 1000))
+
+    def presented(self):
+        """Chamado logo após o flip/update: fecha os registros que esperavam por ele."""
+        if not self._pending:
+            return
+        shown = time.perf_counter() * 1000
+        for phase, kind, since, at, start, end in self._pending:
+            records = self.records.get((phase, kind))
+            if records is None:
+                records = self.records[(phase, kind)] = collections.deque(maxlen=self.size)
+            records.append((at - since, end - start, shown - at, shown - since))
+        self._pending.clear()
+
+    def discard(self):
+        """Esquece registros abertos e a leva atual (fim de sessão, telas fora do loop)."""
+        self._pending.clear()
+        self._window = None
+
+    def summary(self):
+        """{(fase, tipo): {n, p50/p95/max do total, histogramas de total e total_max}}."""
+        result = {}
+        for key, records in self.records.items():
+            totals = sorted(r[2] for r in records)
+            result[key] = {
+                'n': len(records),
+                'p50': percentile(totals, 0.50),
+                'p95': percentile(totals, 0.95),
+                'max': totals[-1] if totals else 0.0,
+                'handler_p50': percentile(sorted(r[1] for r in records), 0.50),
+                'total': histogram(totals),
+                'total_max': histogram(r[3] for r in records),
+            }
+        return result
+
+    def dump(self, path):
+        data = {
+            'campos': list(FIELDS),
+            'faixas': list(BUCKETS),
+            'registros': [
+                {'fase': phase, 'tipo': kind, 'valores': [list(r) for r in records]}
+                for (phase, kind), records in self.records.items()
+            ],
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+
+    def load(self, path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        for entry in data['registros']:
+            records = self.records.setdefault((entry['fase'], entry['tipo']),
+                                              collections.deque(maxlen=self.size))
+            records.extend(tuple(r) for r in entry['valores'])
+
+    def report(self):
+        """Linhas de texto com percentis e histogramas de cada (fase, tipo)."""
+        labels = bucket_labels()
+        lines = [f"{'fase':<16}{'tipo':<8}{'n':>5}{'p50':>8}{'p95':>8}{'máx':>8}{'handler':>9}  (ms, até o flip)"]
+        summary = self.summary()
+        for (phase, kind), s in sorted(summary.items()):
+            lines.append(f"{phase:<16}{kind:<8}{s['n']:>5}{s['p50']:>8.1f}{s['p95']:>8.1f}"
+                         f"{s['max']:>8.1f}{s['handler_p50']:>9.2f}")
+            for name in ('total', 'total_max'):
+                counts = '  '.join(f"{label}:{c}" for label, c in zip(labels, s[name]) if c)
+                lines.append(f"{'':<24}{name:<10}{counts}")
+        return lines
+
+
+TRACER = LatencyTracer()
+
+
+def enable_from_env():
+    """Liga o rastreamento conforme JOGOS_LATENCIA; devolve se ligou."""
+    target = os.environ.get('JOGOS_LATENCIA')
+    if not target:
+        return False
+    TRACER.enable()
+    if target == '1':
+        atexit.register(lambda: print('\n'.join(TRACER.report())))
+    else:
+        atexit.register(TRACER.dump, target)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Relatório de latência entrada→tela de um arquivo gravado.")
+    parser.add_argument('arquivo', help="JSON gravado com JOGOS_LATENCIA=<arquivo>")
+    args = parser.parse_args(argv)
+    tracer = LatencyTracer(size=None)
+    tracer.load(args.arquivo)
+    print('\n'.join(tracer.report()))
+
+
+if __name__ == '__main__':
+    main()
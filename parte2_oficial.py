@@ -1,8 +1,25 @@
+# Primeiro import: marca o início da contagem do tempo até o primeiro quadro
+from inicializacao import TIMER, init_pygame
+
+import os
 import pygame
 import sys
 
-# Inicialização do Pygame
-pygame.init()
+from analise import enable as enable_analytics
+from antecipacao import Prefetcher
+from atlas import ATLAS
+from avaliacoes import load_definitions
+from componentes import Button, Label
+from eventos import ROUTER
+from gravacao import scheduler_from_env
+from latencia import TRACER, enable_from_env as enable_tracing
+from perfil import PROFILER, enable_from_env
+from precarga import Preloader, wait_with_progress
+from recursos import FONTS, IMAGES
+from resultados import STORE, enable_from_env as enable_results, new_session_id
+from texto import TEXT_CACHE, layout_paragraphs
+from transicao import Transition
+
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
 
 # Cores do tema
@@ -12,109 +29,160 @@ FEEDBACK_COLOR = (255, 107, 107)
 TIP_BG = (44, 62, 80)
 TIP_TEXT = (236, 240, 241)
 
-# Fonte padrão
-FONT = pygame.font.SysFont('Arial', 24)
+# Fonte padrão (carregada em startup())
+FONT = None
+
+# JOGOS_QUIOSQUE=1: ao fim de cada sessão volta à tela de boas-vindas no mesmo processo
+KIOSK = os.environ.get('JOGOS_QUIOSQUE') == '1'
 
 
 def load_image(path, size=None):
-    """Carrega imagem e redimensiona se necessário."""
-    img = pygame.image.load(path).convert_alpha()
-    if size:
-        img = pygame.transform.smoothscale(img, size)
-    return img
+    """Carrega imagem redimensionada, usando o cache de assets quando o PNG não mudou."""
+    return IMAGES.load(path, size, smooth=True)
 
 
 def draw_wrapped_text(surface, text, x, y, font, color=TEXT_COLOR, wrap_width=700):
     """Renderiza texto com quebra de linha automática até wrap_width e respeita '\n'."""
-    y_offset = 0
-    for paragraph in text.split('\n'):
-        # wrap cada parágrafo
-        words = paragraph.split(' ')
-        line = ''
-        for word in words:
-            test = f"{line} {word}".strip()
-            if font.size(test)[0] <= wrap_width:
-                line = test
-            else:
-                surface.blit(font.render(line, True, color), (x, y + y_offset))
-                y_offset += font.get_linesize()
-                line = word
-        surface.blit(font.render(line, True, color), (x, y + y_offset))
-        y_offset += font.get_linesize()
-        y_offset += font.get_linesize() // 2
-
+    block = TEXT_CACHE.render(text, font, color, wrap_width, layout_paragraphs)
+    surface.blit(block, (x, y))
+
+
+
+def build_atlas():
+    """Empacota o bruxo e o fundo dos botões de opção no atlas compartilhado."""
+    ATLAS.add('bruxo', load_image('bruxo.png', size=(180, 250)))
+    ATLAS.add_button((80, 40), TIP_BG, 5)
+    return ATLAS.build()
+
+
+def startup():
+    """Inicializa só o que a tela de boas-vindas precisa e devolve a janela."""
+    global FONT
+    screen = init_pygame((SCREEN_WIDTH, SCREEN_HEIGHT), "Jogo de Apoio Psicológico")
+    FONT = FONTS.get('Arial', 24)
+    enable_from_env()
+    enable_tracing()
+    build_atlas()
+    TIMER.mark('recursos')
+    return screen
+
+
+def preload_tasks(screen):
+    """Carga feita em segundo plano durante a tela de boas-vindas."""
+    def prepare_first_screen():
+        manager = PhaseManager(screen)
+        # Textos de todas as perguntas já quebrados e renderizados no cache
+        for assessment in manager.assessments:
+            TEXT_CACHE.render(f"Avaliação de {assessment.title}", FONT, TEXT_COLOR, 700, layout_paragraphs)
+            for question in assessment.questions:
+                TEXT_CACHE.render(question, FONT, TEXT_COLOR, 700, layout_paragraphs)
+        manager.start()
+        for widget in [manager.phase.title_label, manager.phase.question_label] + manager.phase.buttons:
+            widget.prepare()
+        return manager
+
+    return [
+        ('fontes', FONTS.preload),
+        ('definicoes', load_definitions),
+        ('manager', prepare_first_screen),
+    ]
 
 
-def welcome_screen(screen, clock, font):
-    """Exibe tela de boas-vindas com imagem do bruxo."""
-    title_font = pygame.font.SysFont('Arial', 36, bold=True)
-    subtitle_font = pygame.font.SysFont('Arial', 22)
-    bruxo_img = load_image('bruxo.png', size=(180, 250))
+def welcome_screen(screen, scheduler, font, preloader=None):
+    """Exibe tela de boas-vindas com imagem do bruxo; a pré-carga começa após o primeiro quadro."""
+    subtitle_font = FONTS.get('Arial', 22)
     intro_lines = [
         "Bem-vindo ao Teste das Pedras Mágicas!",
         "Clique na opção que melhor traduz",
         "seus sentimentos e descubra seu perfil."
     ]
-    while True:
+    started = False
+
+    def start():
+        nonlocal started
+        started = True
+
+    ROUTER.clear()
+    ROUTER.on_key(pygame.K_RETURN, start)
+    ROUTER.commit()
+    while not started:
         screen.fill(BG_COLOR)
-        img_x = (SCREEN_WIDTH - bruxo_img.get_width()) // 2
-        screen.blit(bruxo_img, (img_x, 30))
+        ATLAS.draw(screen, 'bruxo', ATLAS.get_rect('bruxo', midtop=(SCREEN_WIDTH // 2, 30)))
+        # Textos via cache: fora do primeiro quadro não disputam o FreeType com a pré-carga
         for i, line in enumerate(intro_lines):
             screen.blit(
-                subtitle_font.render(line, True, TIP_TEXT),
+                TEXT_CACHE.render(line, subtitle_font, TIP_TEXT, SCREEN_WIDTH, layout_paragraphs),
                 (50, 300 + i * subtitle_font.get_linesize())
             )
         prompt = "Pressione ENTER para iniciar"
-        render = subtitle_font.render(prompt, True, TIP_TEXT)
+        render = TEXT_CACHE.render(prompt, subtitle_font, TIP_TEXT, SCREEN_WIDTH, layout_paragraphs)
         rect = render.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
         pygame.draw.rect(screen, TIP_BG, rect.inflate(20, 10), border_radius=5)
         screen.blit(render, rect)
-        for event in pygame.event.get():
+        pygame.display.flip()
+        if TIMER.first_frame is None:
+            TIMER.first_frame_shown()
+            # O restante só é carregado depois que a primeira tela apareceu
+            if preloader is not None:
+                preloader.start()
+        for event in scheduler.events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                return
-        pygame.display.flip()
-        clock.tick(30)
+            ROUTER.dispatch(event)
 
 
-class Button:
-    """Botão genérico para cliques."""
-    def __init__(self, rect, text, callback, font, color=TIP_BG, text_color=TEXT_COLOR):
-        self.rect = pygame.Rect(rect)
-        self.text = text
-        self.callback = callback
-        self.font = font
-        self.color = color
-        self.text_color = text_color
+class Phase:
+    """Base das fases: só repinta quando há regiões sujas e devolve essas regiões."""
+    def __init__(self, screen):
+        self.screen = screen
+        # Uma fase nova sempre começa com repintura completa
+        self.dirty = [screen.get_rect()]
 
-    def draw(self, surface):
-        pygame.draw.rect(surface, self.color, self.rect, border_radius=5)
-        txt = self.font.render(self.text, True, self.text_color)
-        surface.blit(txt, txt.get_rect(center=self.rect.center))
+    def invalidate(self, rect=None):
+        self.dirty.append(pygame.Rect(rect) if rect else self.screen.get_rect())
 
-    def handle_event(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos):
-            self.callback()
+    def draw(self):
+        """Repinta se necessário e devolve os retângulos alterados desde o último quadro."""
+        if not self.dirty:
+            return []
+        self.paint()
+        rects, self.dirty = self.dirty, []
+        return rects
+
+    def paint(self):
+        raise NotImplementedError
+
+    def bind(self, router):
+        """Registra em router os eventos que a fase trata."""
+
+    def prefetch(self, prefetcher):
+        """Agenda em prefetcher o que a próxima tela vai precisar."""
 
 
-class AssessmentPhase:
+class AssessmentPhase(Phase):
     """Fase de apresentação de perguntas e coleta de respostas."""
-    def __init__(self, screen, title, questions, categories, recommendations):
-        self.screen = screen
-        self.title = title
-        self.questions = questions
-        self.categories = categories
-        self.recommendations = recommendations
+    # Região da pergunta, única parte da tela que muda entre perguntas
+    QUESTION_AREA = pygame.Rect(0, 80, SCREEN_WIDTH, SCREEN_HEIGHT - 180)
+    # Telas de resultado (uma superfície inteira cada) só são adiantadas perto do fim
+    RESULT_PREFETCH_WINDOW = 2
+
+    def __init__(self, screen, assessment):
+        super().__init__(screen)
+        self.assessment = assessment
+        self.title = assessment.title
+        self.questions = assessment.questions
         self.index = 0
         self.score = 0
+        self.answers = []
         self.options = ['0', '1', '2', '3', '4']
+        self.title_label = Label(f"Avaliação de {self.title}", FONT, (50, 20))
+        self.question_label = Label(self.questions[0], FONT, (50, 80))
+        # As opções nunca mudam: os botões são criados uma vez e valem para todas as perguntas
         self.buttons = []
         self._create_option_buttons()
 
     def _create_option_buttons(self):
-        self.buttons.clear()
         w, h, gap = 80, 40, 100
         x0, y0 = 100, SCREEN_HEIGHT - 100
         for i, opt in enumerate(self.options):
@@ -122,268 +190,159 @@ class AssessmentPhase:
                 (x0 + i * gap, y0, w, h),
                 opt,
                 callback=lambda v=i: self._select(v),
-                font=FONT
+                font=FONT,
+                color=TIP_BG,
+                text_color=TEXT_COLOR
             )
             self.buttons.append(btn)
 
     def _select(self, val):
         self.score += val
+        self.answers.append(val)
         self.index += 1
         if self.index >= len(self.questions):
             self._finish()
         else:
-            self._create_option_buttons()
+            # Pergunta já renderizada num quadro ocioso, se deu tempo
+            prefetched = PhaseManager.instance.prefetcher.take(('pergunta', self.title, self.index))
+            self.question_label.set_text(self.questions[self.index], prefetched)
+            self.invalidate(self.QUESTION_AREA)
+
+    def _result(self, category):
+        return f"{self.title}: {category}", self.assessment.recommendations.get(category, '')
 
     def _finish(self):
-        category = next(
-            (n for n, (low, high) in self.categories.items() if low <= self.score <= high),
-            'NORMAL'
-        )
-        rec_text = self.recommendations.get(category, '')
+        category = self.assessment.categorize(self.score)
+        PhaseManager.instance.record(self, category)
+        result_title, rec_text = self._result(category)
         PhaseManager.instance.next_step(
-            result_title=f"{self.title}: {category}",
+            result_title=result_title,
             result_text=rec_text
         )
 
-    def draw(self):
+    def reachable_categories(self):
+        """Categorias ainda possíveis com as perguntas que faltam."""
+        remaining = len(self.questions) - self.index
+        top = self.score + remaining * (len(self.options) - 1)
+        return {self.assessment.categorize(s) for s in range(self.score, top + 1)}
+
+    def prefetch(self, prefetcher):
+        keys = []
+        nxt = self.index + 1
+        if nxt < len(self.questions):
+            key = ('pergunta', self.title, nxt)
+            prefetcher.request(key, lambda: TEXT_CACHE.render(
+                self.questions[nxt], FONT, TEXT_COLOR, 700, layout_paragraphs))
+            keys.append(key)
+        if len(self.questions) - self.index <= self.RESULT_PREFETCH_WINDOW:
+            for category in sorted(self.reachable_categories()):
+                key = ('resultado',) + self._result(category)
+                prefetcher.request(key, lambda k=key: ResultPhase.prerender(self.screen, k[1], k[2]))
+                keys.append(key)
+        prefetcher.retain(keys)
+
+    def paint(self):
         self.screen.fill(BG_COLOR)
-        draw_wrapped_text(self.screen, f"Avaliação de {self.title}", 50, 20, FONT)
-        draw_wrapped_text(self.screen, self.questions[self.index], 50, 80, FONT)
+        self.title_label.draw(self.screen)
+        self.question_label.draw(self.screen)
         for btn in self.buttons:
             btn.draw(self.screen)
 
-    def handle_event(self, event):
+    def bind(self, router):
         for btn in self.buttons:
-            btn.handle_event(event)
+            router.on_click(btn, btn.callback)
 
 
-class ResultPhase:
+class ResultPhase(Phase):
     """Fase de exibição do resultado e recomendações."""
-    def __init__(self, screen, title, text):
-        self.screen = screen
+    def __init__(self, screen, title, text, prepared=None):
+        super().__init__(screen)
         self.title = title
         self.text = text
-
-    def draw(self):
+        # Tela inteira já pintada fora da tela pelo prefetcher
+        self.prepared = prepared
+
+    @classmethod
+    def prerender(cls, screen, title, text):
+        """Pinta a fase numa superfície fora da tela, no formato da janela."""
+        surface = pygame.Surface(screen.get_size()).convert()
+        cls(surface, title, text).paint()
+        return surface
+
+    def paint(self):
+        if self.prepared is not None:
+            self.screen.blit(self.prepared, (0, 0))
+            return
         self.screen.fill(TIP_BG)
         draw_wrapped_text(self.screen, self.title, 50, 50, FONT, color=FEEDBACK_COLOR)
         draw_wrapped_text(self.screen, self.text, 50, 100, FONT)
         prompt = "Pressione ENTER para continuar..."
-        self.screen.blit(FONT.render(prompt, True, TIP_TEXT), (50, SCREEN_HEIGHT - 50))
+        draw_wrapped_text(self.screen, prompt, 50, SCREEN_HEIGHT - 50, FONT, color=TIP_TEXT)
 
-    def handle_event(self, event):
-        if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-            PhaseManager.instance.next_step()
+    def bind(self, router):
+        router.on_key(pygame.K_RETURN, PhaseManager.instance.next_step)
 
 
-class ThankYouPhase:
+class ThankYouPhase(Phase):
     """Fase final de agradecimento."""
-    def __init__(self, screen):
-        self.screen = screen
-
-    def draw(self):
+    def paint(self):
         self.screen.fill(BG_COLOR)
         lines = [
             "Obrigado por participar!",
             "Lembre-se sempre de buscar o apoio de um adulto,",
             "psicólogo, professor, amigos ou familiares.",
             "",
-            "Pressione ENTER para sair."
+            "Pressione ENTER para recomeçar." if KIOSK else "Pressione ENTER para sair."
         ]
+        font_small = FONTS.get('Arial', 22)
         for i, line in enumerate(lines):
             color = TEXT_COLOR if line else TEXT_COLOR
-            FONT_SMALL = pygame.font.SysFont('Arial', 22)
-            self.screen.blit(FONT_SMALL.render(line, True, color),
-                             (50, 200 + i * (FONT_SMALL.get_linesize()+5)))
+            self.screen.blit(font_small.render(line, True, color),
+                             (50, 200 + i * (font_small.get_linesize()+5)))
 
-    def handle_event(self, event):
-        if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-            pygame.quit()
-            sys.exit()
+    def bind(self, router):
+        router.on_key(pygame.K_RETURN, PhaseManager.instance.finish)
 
 
 class PhaseManager:
     """Gerencia a sequência de fases: Depressão, Ansiedade e Estresse."""
     instance = None
 
-    def __init__(self, screen):
+    def __init__(self, screen, dirty_rects=True):
         PhaseManager.instance = self
         self.screen = screen
-
-        # Configuração Depressão
-        depression_questions = [
-            "Você se sentiu para baixo, deprimido ou sem esperança nas últimas duas semanas?",
-            "Você teve pouco interesse ou prazer em fazer as coisas?",
-            "Você teve dificuldade para dormir ou dormiu demais?",
-            "Você se sentiu cansado ou com pouca energia?",
-            "Você teve pouco apetite ou comeu em excesso?"
-        ]
-        depression_cats = {
-            'NORMAL': (0, 4),
-            'LEVE': (5, 9),
-            'MODERADO': (10, 14),
-            'SEVERO': (15, 19),
-            'EXTREMAMENTE SEVERO': (20, 27)
-        }
-        depression_recs = {
-            'NORMAL': (
-                "- Nenhuma intervenção imediata necessária.\n"
-                "- Continuar monitorando bem-estar emocional.\n"
-                "- Prática criativa: artesanato, música, esporte leve."
-            ),
-            'LEVE': (
-                "- Autoconhecimento: monitorar humor e sintomas.\n"
-                "- Hábitos Saudáveis: exercícios, dieta e sono.\n"
-                "- Gerenciamento do Estresse: mindfulness e respiração.\n"
-                "- Suporte Social: amigos e familiares.\n"
-                "- Prática criativa: artesanato, música, esporte leve."
-            ),
-            'MODERADO': (
-                "- Tratamento Multidisciplinar: avaliação psiquiátrica e psicoterapia e/ou medicamentos.\n"
-                "- Suporte Psicossocial: encorajamento e apoio emocional.\n"
-                "- Hábitos Saudáveis: exercícios, dieta equilibrada e relaxamento.\n"
-                "- Acompanhamento Regular: consultas para monitorar e ajustar tratamento.\n"
-                "- Prática criativa: artesanato, música, esporte leve."
-            ),
-            'SEVERO': (
-                "- Tratamento Psiquiátrico Urgente: avaliação imediata e possível hospitalização.\n"
-                "- Terapia Intensiva (TCC): desenvolver habilidades de enfrentamento.\n"
-                "- Medicação Antidepressiva: ISRS ou outros sob supervisão.\n"
-                "- Suporte Psicossocial: apoio contínuo da rede de relacionamento.\n"
-                "- Monitoramento Contínuo: consultas frequentes para ajustes.\n"
-                "- Prática criativa: artesanato, música, esporte leve."
-            ),
-            'EXTREMAMENTE SEVERO': (
-                "- Intervenção Psiquiátrica Urgente: avaliação imediata e internação se necessário.\n"
-                "- Terapia Intensiva e Monitoramento 24/7: suporte contínuo.\n"
-                "- Medicação Antidepressiva e Antipsicótica: supervisão médica.\n"
-                "- Suporte Psicossocial Intensivo: apoio emocional intenso.\n"
-                "- Intervenção de Crise: plano de segurança para ideação suicida.\n"
-                "- Prática criativa: artesanato, música, esporte leve."
-            )
-        }
-
-        # Configuração Ansiedade
-        anxiety_questions = [
-            "Você se sentiu nervoso, ansioso ou no limite?",
-            "Você não conseguiu parar ou controlar suas preocupações?",
-            "Você teve dificuldade para relaxar?",
-            "Você se sentiu inquieto ou agitado?",
-            "Você teve dificuldade de concentração?"
-        ]
-        anxiety_cats = depression_cats
-        anxiety_recs = {
-            'NORMAL': (
-                "- Manter hábitos saudáveis: exercícios e sono.\n"
-                "- Mindfulness e respiração.\n"
-                "- Hobbies para relaxar.\n"
-                "- Gestão de tempo.\n"
-                "- Consultas periódicas."
-            ),
-            'LEVE': (
-                "- Autocuidado: exercícios, dieta e sono.\n"
-                "- Mindfulness ou meditação.\n"
-                "- Psicoterapia breve.\n"
-                "- Planejamento de tempo.\n"
-                "- Autoavaliação e consultas."
-            ),
-            'MODERADO': (
-                "- Psicoterapia (TCC): sessões regulares.\n"
-                "- Relaxamento: yoga e meditação.\n"
-                "- Atividade Física: alívio de sintomas.\n"
-                "- Suporte Social: grupos e amigos.\n"
-                "- Monitoramento: ajustes periódicos."
-            ),
-            'SEVERO': (
-                "- Intervenção Especializada: psicólogo e psiquiatra.\n"
-                "- Medicação: ansiolíticos ou antidepressivos.\n"
-                "- Técnicas Avançadas: biofeedback e meditação guiada.\n"
-                "- Suporte Social: grupos de apoio.\n"
-                "- Monitoramento Contínuo: acompanhamento aprofundado."
-            ),
-            'EXTREMAMENTE SEVERO': (
-                "- Intervenção Psiquiátrica Imediata: consulta urgente e medicação.\n"
-                "- Psicoterapia Intensiva: TCC ou semelhante.\n"
-                "- Técnicas Avançadas: biofeedback e meditação guiada.\n"
-                "- Rede de Apoio: suporte emocional contínuo.\n"
-                "- Monitoramento e Ajuste: revisões constantes."
-            )
-        }
-
-        # Configuração Estresse
-        stress_questions = [
-            "Você se sentiu estressado ou irritado?",
-            "Você teve dificuldade para relaxar ou acalmar a mente?",
-            "Você se sentiu sobrecarregado pelas responsabilidades?",
-            "Você teve problemas para dormir por causa do estresse?",
-            "Você sentiu sintomas físicos relacionados ao estresse, como dores de cabeça ou tensão muscular?"
-        ]
-        stress_cats = depression_cats
-        stress_recs = {
-            'NORMAL': (
-                "- Manutenção de Hábitos Saudáveis: exercícios, alimentação balanceada e sono adequado.\n"
-                "- Relaxamento: mindfulness, respiração ou meditação.\n"
-                "- Lazer: hobbies e atividades recreativas.\n"
-                "- Monitoramento de Estresse: gerenciamento de tempo e planejamento.\n"
-                "- Apoio Social: rede de suporte sólida.\n"
-                "- Consultas Periódicas: check-ups regulares."
-            ),
-            'LEVE': (
-                "- Autocuidado: rotina de exercícios, alimentação e sono.\n"
-                "- Relaxamento: mindfulness e meditação.\n"
-                "- Psicoterapia breve: aconselhamento.\n"
-                "- Planejamento de tempo: gerenciamento de estresse.\n"
-                "- Monitoramento: autoavaliação regular."
-            ),
-            'MODERADO': (
-                "- Psicoterapia (TCC): sessões regulares.\n"
-                "- Relaxamento: yoga e meditação.\n"
-                "- Atividade Física: alívio de sintomas.\n"
-                "- Suporte Social: grupos e amigos.\n"
-                "- Gerenciamento de Estresse: técnicas estruturadas.\n"
-                "- Monitoramento: avaliações periódicas."
-            ),
-            'SEVERO': (
-                "- Intervenção Psiquiátrica Imediata: consulta urgente e possível medicação.\n"
-                "- Psicoterapia intensiva: TCC intensivo.\n"
-                "- Técnicas Avançadas: biofeedback e programas estruturados.\n"
-                "- Suporte Social e Familiar: envolvimento da rede de apoio.\n"
-                "- Monitoramento Contínuo: ajustes frequentes."
-            ),
-            'EXTREMAMENTE SEVERO': (
-                "- Intervenção Psiquiátrica Urgente: avaliação imediata e medicação.\n"
-                "- Psicoterapia Intensiva: TCC ou ACT intensivos.\n"
-                "- Técnicas Avançadas: meditação guiada e biofeedback.\n"
-                "- Rede de Apoio: suporte emocional contínuo.\n"
-                "- Acompanhamento Médico Regular: revisão de plano de tratamento."
-            )
-        }
-
-        # Lista de avaliações
-        self.assessments = [
-            {'title': 'Depressão', 'questions': depression_questions, 'categories': depression_cats, 'recommendations': depression_recs},
-            {'title': 'Ansiedade', 'questions': anxiety_questions, 'categories': anxiety_cats, 'recommendations': anxiety_recs},
-            {'title': 'Estresse',   'questions': stress_questions,   'categories': stress_cats,   'recommendations': stress_recs}
-        ]
+        # Com dirty_rects=False toda a tela é repintada a cada quadro
+        self.dirty_rects = dirty_rects
+        self.transition = Transition(screen, duration=300)
+        self.prefetcher = Prefetcher()
+        self.router = ROUTER
+        # Fase cujas rotas estão registradas no router
+        self.routed = None
+
+        # Avaliações compiladas de avaliacoes.json (carregadas uma vez por processo)
+        self.assessments = load_definitions().assessments
         self.current = 0
         self.phase = None
+        # Fim da sessão (ENTER na tela de agradecimento)
+        self.done = False
+        # (avaliação, pontuação, categoria, respostas) de cada avaliação concluída
+        self.results = []
+        self.session_id = new_session_id()
 
     def start(self):
         self._start_assessment()
 
     def _start_assessment(self):
-        data = self.assessments[self.current]
-        self.phase = AssessmentPhase(
-            self.screen,
-            data['title'],
-            data['questions'],
-            data['categories'],
-            data['recommendations']
-        )
+        self.phase = AssessmentPhase(self.screen, self.assessments[self.current])
 
     def next_step(self, result_title=None, result_text=None):
+        if self.phase is not None:
+            self.transition.start()
         if result_title:
-            self.phase = ResultPhase(self.screen, result_title, result_text)
+            prepared = self.prefetcher.take(('resultado', result_title, result_text))
+            # As telas das outras categorias ficaram inalcançáveis: libera a memória e a fila
+            self.prefetcher.retain([])
+            self.phase = ResultPhase(self.screen, result_title, result_text, prepared)
         else:
             self.current += 1
             if self.current < len(self.assessments):
@@ -391,30 +350,119 @@ class PhaseManager:
             else:
                 self.phase = ThankYouPhase(self.screen)
 
+    def finish(self):
+        self.done = True
+
+    def record(self, phase, category):
+        """Guarda o resultado de uma avaliação concluída e o envia ao banco."""
+        self.results.append((phase.title, phase.score, category, list(phase.answers)))
+        STORE.save({
+            'sessao': self.session_id,
+            'jogo': 'parte2_oficial',
+            'questionario': phase.title,
+            'pontuacao': phase.score,
+            'categoria': category,
+            'respostas': phase.answers,
+        })
+
+    def _route(self):
+        """Troca as rotas de eventos pelas da fase atual (sempre na thread principal)."""
+        if self.routed is self.phase:
+            return
+        self.routed = self.phase
+        self.router.clear()
+        self.router.on(pygame.VIDEOEXPOSE, self._expose)
+        self.router.on(pygame.WINDOWEXPOSED, self._expose)
+        self.phase.bind(self.router)
+        PROFILER.bind(self.router, on_toggle=lambda: self.phase.invalidate())
+        self.router.commit()
+
+    def _expose(self, event):
+        # A janela foi descoberta: o conteúdo antigo não vale mais
+        self.phase.invalidate()
+
     def draw(self):
-        self.phase.draw()
+        """Desenha a fase atual e devolve os retângulos que precisam ir para a tela."""
+        self._route()
+        if not self.dirty_rects or self.transition.running:
+            self.phase.invalidate()
+        rects = self.phase.draw()
+        if self.transition.running:
+            # Durante a transição a tela inteira muda a cada quadro
+            self.transition.apply()
+            rects = [self.screen.get_rect()]
+        return rects
+
+    def idle(self, budget_ms=8):
+        """Chamado em quadros sem nada a desenhar; devolve se ainda há trabalho adiantado."""
+        self.phase.prefetch(self.prefetcher)
+        return self.prefetcher.step(budget_ms)
 
     def handle_event(self, event):
-        self.phase.handle_event(event)
+        self._route()
+        self.router.dispatch(event)
 
 
-def main():
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("Jogo de Apoio Psicológico")
-    clock = pygame.time.Clock()
-    welcome_screen(screen, clock, FONT)
+def session_results():
+    """Pontuação e categoria das avaliações concluídas na sessão atual."""
+    manager = PhaseManager.instance
+    if manager is None:
+        return []
+    return [{'avaliacao': title, 'pontuacao': score, 'categoria': category, 'respostas': answers}
+            for title, score, category, answers in manager.results]
+
+
+def new_session(screen):
+    """PhaseManager de uma sessão nova; fontes, imagens, definições e textos seguem em cache."""
     manager = PhaseManager(screen)
     manager.start()
+    return manager
+
+
+def run_session(screen, scheduler, manager):
+    """Loop principal de uma sessão, até o ENTER da tela de agradecimento."""
+    while not manager.done:
+        events = scheduler.events()
+        phase_name = type(manager.phase).__name__
+        TRACER.received(scheduler, phase_name)
+        PROFILER.begin(phase_name)
+        with PROFILER.stage('eventos'):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                manager.handle_event(event)
+        with PROFILER.stage('desenho'):
+            rects = manager.draw()
+        rects += PROFILER.draw_overlay(screen)
+        with PROFILER.stage('flip'):
+            if rects:
+                pygame.display.update(rects)
+                TRACER.presented()
+        PROFILER.end()
+        if manager.transition.running:
+            scheduler.keep_active()
+        elif not rects and manager.idle():
+            # Continua na taxa cheia enquanto houver telas a adiantar
+            scheduler.keep_active()
+    # O que foi tratado sem chegar à tela não pertence à próxima sessão
+    TRACER.discard()
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            manager.handle_event(event)
-        manager.draw()
-        pygame.display.flip()
-        clock.tick(30)
+
+def main():
+    screen = startup()
+    enable_results()
+    enable_analytics()
+    scheduler = scheduler_from_env(30, 'parte2_oficial')
+    preloader = Preloader(preload_tasks(screen))
+    welcome_screen(screen, scheduler, FONT, preloader)
+    manager = wait_with_progress(screen, scheduler, preloader, FONT, BG_COLOR, TIP_TEXT, TIP_BG)['manager']
+    run_session(screen, scheduler, manager)
+    while KIOSK:
+        welcome_screen(screen, scheduler, FONT)
+        run_session(screen, scheduler, new_session(screen))
+    pygame.quit()
+    sys.exit()
 
 
 if __name__ == '__main__':
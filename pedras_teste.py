@@ -1,6 +1,24 @@
+# Primeiro import: marca o início da contagem do tempo até o primeiro quadro
+from inicializacao import TIMER, init_pygame
+
+import os
 import pygame
 import sys
 
+from analise import enable as enable_analytics
+from atlas import ATLAS
+from avaliacoes import load_definitions
+from componentes import Button, Label, Stone
+from eventos import ROUTER
+from gravacao import scheduler_from_env
+from latencia import TRACER, enable_from_env as enable_tracing
+from perfil import PROFILER, enable_from_env
+from precarga import Preloader, wait_with_progress
+from recursos import FONTS, IMAGES
+from resultados import STORE, enable_from_env as enable_results, new_session_id
+from texto import TEXT_CACHE, layout_words
+from transicao import Transition
+
 # Cores e texto
 BG_COLOR = (34, 40, 49)
 TEXT_COLOR = (228, 241, 254)
@@ -8,227 +26,300 @@ FEEDBACK_COLOR = (255, 107, 107)
 TIP_BG = (44, 62, 80)
 TIP_TEXT = (236, 240, 241)
 
-# Questões e opções
-questions = [
-    "1. Achei difícil me acalmar",
-    "2. Senti minha boca seca",
-    "3. Não consegui vivenciar nenhum sentimento positivo",
-    "4. Tive dificuldade em respirar (ex: respiração ofegante)",
-    "5. Achei difícil ter iniciativa para fazer as coisas",
-    "6. Reagi de forma exagerada às situações",
-    "7. Senti tremores (ex: nas mãos)",
-    "8. Senti que estava sempre nervoso",
-    "9. Tive medo de parecer ridículo(a) em público",
-    "10. Senti que não tinha nada a desejar",
-    "11. Senti-me agitado",
-    "12. Achei difícil relaxar",
-    "13. Senti-me sem ânimo",
-    "14. Fui intolerante com dificuldades",
-    "15. Tive sensação de pânico",
-    "16. Não consegui me entusiasmar com nada",
-    "17. Senti que não tinha valor",
-    "18. Estava emotivo(a) demais",
-    "19. Coração acelerado mesmo em repouso",
-    "20. Senti medo sem motivo",
-    "21. A vida parecia sem sentido"
-]
-
-options = [
-    "Aplicou-se em algum grau, ou por pouco de tempo",
-    "Aplicou-se em um grau considerável, ou por boa parte do tempo",
-    "Aplicou-se muito, ou na maioria do tempo",
-    "Não se aplicou de maneira alguma"
-]
-score_map = [1, 2, 3, 0]
-option_colors = {
-    options[0]: (255, 223, 0),
-    options[1]: (0, 255, 0),
-    options[2]: (0, 128, 255),
-    options[3]: (255, 0, 0)
-}
+# Cor da pedra de cada opção, na ordem das opções de avaliacoes.json
+option_color_list = [(255, 223, 0), (0, 255, 0), (0, 128, 255), (255, 0, 0)]
 click_counter = {"Amarelo": 0, "Verde": 0, "Azul": 0, "Vermelho": 0}
+stone_files = {
+    "Amarelo": "pedra_amarela.png",
+    "Verde": "pedra_verde.png",
+    "Azul": "pedra_azul.png",
+    "Vermelho": "pedra_vermelha.png"
+}
+BUTTON_COLOR = (3, 218, 197)
+# Respostas e resultado da última sessão concluída
+last_result = None
+# JOGOS_QUIOSQUE=1: ao fim de cada sessão volta à tela de boas-vindas no mesmo processo
+KIOSK = os.environ.get("JOGOS_QUIOSQUE") == "1"
 
-tips = [
-    "1. Respiração profunda ajuda a acalmar.",
-    "2. Relaxamento muscular é eficaz.",
-    "3. Durma bem e regularmente.",
-    "4. Converse com alguém de confiança.",
-    "5. Caminhadas leves são saudáveis.",
-    "6. Experimente mindfulness por 5 minutos.",
-    "7. Escreva em um diário suas emoções."
-]
+def render_wrapped_text(text, font, color=TEXT_COLOR, max_width=500):
+    return TEXT_CACHE.render(text, font, color, max_width, layout_words)
 
 def draw_wrapped_text(surface, text, x, y, font, color=TEXT_COLOR, max_width=500):
-    words = text.split()
-    line = ''
-    line_height = font.get_linesize()
-    for word in words:
-        test_line = line + word + ' '
-        if font.size(test_line)[0] > max_width:
-            surface.blit(font.render(line.strip(), True, color), (x, y))
-            y += line_height
-            line = word + ' '
-        else:
-            line = test_line
-    if line:
-        surface.blit(font.render(line.strip(), True, color), (x, y))
+    surface.blit(render_wrapped_text(text, font, color, max_width), (x, y))
 
 def load_image(path, size=None):
-    img = pygame.image.load(path).convert_alpha()
-    return pygame.transform.scale(img, size) if size else img
-
-def fade(screen, clock, fade_in=True, speed=10):
-    fade_surf = pygame.Surface(screen.get_size()).convert()
-    for alpha in (range(255, -1, -speed) if fade_in else range(0, 256, speed)):
-        fade_surf.fill(BG_COLOR)
-        fade_surf.set_alpha(alpha)
-        screen.blit(fade_surf, (0, 0))
-        pygame.display.update()
-        clock.tick(60)
+    return IMAGES.load(path, size, smooth=False)
+
+def build_atlas():
+    # Só o que a tela de boas-vindas usa; as pedras entram na pré-carga
+    ATLAS.add("bruxo", load_image("bruxo.png", size=(180, 250)))
+    ATLAS.add_button((220, 45), BUTTON_COLOR, 12)
+    return ATLAS.build()
+
+def build_game_atlas():
+    for name, path in stone_files.items():
+        ATLAS.add(name, load_image(path, (60, 60)))
+    ATLAS.add_button((200, 50), BUTTON_COLOR, 8, TEXT_COLOR, 2)
+    return ATLAS.build()
+
+def preload_tasks(font):
+    def prepare_first_screen():
+        stone_test = load_definitions().stones
+        wrapped_label(stone_test.questions[0], font, (20, 20)).prepare()
+        for opt in stone_test.options:
+            wrapped_label(opt, font, (0, 0), max_width=350).prepare()
+        return stone_test
+
+    return [
+        ("fontes", FONTS.preload),
+        ("atlas", build_game_atlas),
+        ("stone_test", prepare_first_screen),
+    ]
+
+COLOR_NAMES = {
+    (255, 223, 0): "Amarelo",
+    (0, 255, 0): "Verde",
+    (0, 128, 255): "Azul",
+    (255, 0, 0): "Vermelho"
+}
 
 def get_color_name(rgb):
-    return {
-        (255, 223, 0): "Amarelo",
-        (0, 255, 0): "Verde",
-        (0, 128, 255): "Azul",
-        (255, 0, 0): "Vermelho"
-    }.get(rgb, "Desconhecido")
-
-def create_single_button(screen, font, text):
+    return COLOR_NAMES.get(rgb, "Desconhecido")
+
+def create_single_button(screen, font, text, label_x=30):
     w, h = 200, 50
     rect = pygame.Rect((screen.get_width()-w)//2, screen.get_height()-80, w, h)
-    return rect, text
+    return Button(rect, text, font=font, color=BUTTON_COLOR, radius=8,
+                  border_color=TEXT_COLOR, border_width=2, label_offset=(label_x, 10))
+
+def wrapped_label(text, font, pos, color=TEXT_COLOR, max_width=500):
+    return Label(text, font, pos, color, max_width, layout_words)
 
-def welcome_screen(screen, clock, font):
-    title_font = pygame.font.SysFont('Arial', 30, bold=True)
-    subtitle_font = pygame.font.SysFont('Arial', 22)
-    bruxo_img = load_image("bruxo.png", size=(180, 250))
+def create_stones(screen, font, option_colors):
+    stones = []
+    x = screen.get_width() // 2 - 100
+    spacing = 100
+    for i, (opt, color) in enumerate(option_colors.items()):
+        center = (x, 150 + i * spacing)
+        label = wrapped_label(opt, font, (center[0] + 50, center[1] - 25), max_width=350)
+        stones.append(Stone(get_color_name(color), center, i, label))
+    return stones
+
+def draw_stone_screen(screen, batch, question_label, stones):
+    screen.fill(BG_COLOR)
+    # Pergunta, pedras e rótulos saem num único blits(); flush() esvazia o lote para o próximo quadro
+    question_label.add_to(batch)
+    for stone in stones:
+        stone.add_to(batch)
+    batch.flush(screen)
+
+def route(*clicks):
+    # Só os widgets da tela atual recebem cliques; o resto da fila fica bloqueado
+    ROUTER.clear()
+    for widget, handler in clicks:
+        ROUTER.on_click(widget, handler)
+    PROFILER.bind(ROUTER)
+    ROUTER.commit()
+
+def welcome_screen(screen, scheduler, font, preloader=None):
+    title_font = FONTS.get('Arial', 30, bold=True)
+    subtitle_font = FONTS.get('Arial', 22)
+    bruxo_rect = ATLAS.get_rect("bruxo", midtop=(screen.get_width() // 2, 30))
+    intro = (
+        "Você está prestes a iniciar uma jornada mágica de autoconhecimento. "
+        "Cada pergunta revelará uma pedra mágica representando uma parte de você. "
+        "Clique na pedra que melhor representa como você se sentiu."
+    )
+    labels = [
+        wrapped_label("Bem-vindo ao Teste das Pedras Mágicas", title_font, (100, 280)),
+        wrapped_label(intro, subtitle_font, (80, 350), max_width=640),
+    ]
+    start_btn = Button(((screen.get_width() - 220) // 2, 500, 220, 45), "Iniciar Jornada",
+                       font=subtitle_font, color=BUTTON_COLOR, radius=12, label_offset=(35, 10))
 
     run = True
+
+    def start():
+        nonlocal run
+        run = False
+
+    route((start_btn, start))
     while run:
         screen.fill(BG_COLOR)
-        screen.blit(bruxo_img, ((screen.get_width() - bruxo_img.get_width()) // 2, 30))
-        draw_wrapped_text(screen, "Bem-vindo ao Teste das Pedras Mágicas", 100, 280, title_font)
-        intro = (
-            "Você está prestes a iniciar uma jornada mágica de autoconhecimento. "
-            "Cada pergunta revelará uma pedra mágica representando uma parte de você. "
-            "Clique na pedra que melhor representa como você se sentiu."
-        )
-        draw_wrapped_text(screen, intro, 80, 350, subtitle_font, max_width=640)
-        start_btn = pygame.Rect((screen.get_width() - 220) // 2, 500, 220, 45)
-        pygame.draw.rect(screen, (3, 218, 197), start_btn, border_radius=12)
-        draw_wrapped_text(screen, "Iniciar Jornada", start_btn.x + 35, start_btn.y + 10, subtitle_font)
-
-        for event in pygame.event.get():
+        ATLAS.draw(screen, "bruxo", bruxo_rect)
+        for label in labels:
+            label.draw(screen)
+        start_btn.draw(screen)
+
+        pygame.display.flip()
+        if TIMER.first_frame is None:
+            TIMER.first_frame_shown()
+            # O restante só é carregado depois que a primeira tela apareceu
+            if preloader is not None:
+                preloader.start()
+
+        for event in scheduler.events():
             if event.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if start_btn.collidepoint(event.pos):
-                    run = False
+            ROUTER.dispatch(event)
 
-        pygame.display.flip()
-        clock.tick(60)
+class StoneGame:
+    """Uma sessão: perguntas com pedras, resultado e dicas; os cliques chegam pelo ROUTER."""
+    def __init__(self, screen, font, stone_test, transition):
+        self.screen = screen
+        self.font = font
+        self.stone_test = stone_test
+        self.transition = transition
+        self.questions = stone_test.questions
+        self.session_id = new_session_id()
+        self.current_q = 0
+        self.answers = []
+        self.running = True
+        self.phase = 1
+        self.game_over = False
+        self.feedback = ""
+        self.btn_show_tips = None
+        self.btn_exit = None
 
-def main():
-    pygame.init()
-    screen = pygame.display.set_mode((800, 600))
-    clock = pygame.time.Clock()
-    font = pygame.font.SysFont('Arial', 22)
-    welcome_screen(screen, clock, font)
-
-    current_q = 0
-    answers = []
-    running = True
-    phase = 1
-    game_over = False
-    feedback = ""
-    btn_show_tips = None
-    btn_exit = None
-
-    pedra_imagens = {
-        "Amarelo": load_image("pedra_amarela.png", (60, 60)),
-        "Verde": load_image("pedra_verde.png", (60, 60)),
-        "Azul": load_image("pedra_azul.png", (60, 60)),
-        "Vermelho": load_image("pedra_vermelha.png", (60, 60))
-    }
+        # Widgets criados uma vez; entre perguntas só o texto da pergunta muda
+        option_colors = dict(zip(stone_test.options, option_color_list))
+        self.question_label = wrapped_label(self.questions[0], font, (20, 20))
+        self.stones = create_stones(screen, font, option_colors)
+        self.batch = ATLAS.batch()
+        self.result_labels = []
+        self.tip_labels = []
 
-    stones = []
-    x = screen.get_width() // 2 - 100
-    spacing = 100
-    for i, (opt, color) in enumerate(option_colors.items()):
-        stones.append({"center": (x, 150 + i * spacing), "radius": 30, "color": color, "label": opt})
+    @property
+    def phase_name(self):
+        return "dicas" if self.phase == 2 else "resultado" if self.game_over else "perguntas"
 
-    while running:
-        mouse_pos = pygame.mouse.get_pos()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if phase == 1 and not game_over:
-                    for stone in stones:
-                        dx = event.pos[0] - stone["center"][0]
-                        dy = event.pos[1] - stone["center"][1]
-                        if dx * dx + dy * dy <= stone["radius"] ** 2:
-                            fade(screen, clock, fade_in=False)
-                            idx = options.index(stone["label"])
-                            answers.append(idx)
-                            click_counter[get_color_name(stone["color"])] += 1
-                            current_q += 1
-                            if current_q >= len(questions):
-                                game_over = True
-                                avg = sum(score_map[a] for a in answers) / len(questions)
-                                feedback = "Preocupante" if avg >= 2 else "Não preocupante"
-                                btn_show_tips = create_single_button(screen, font, "Ver Dicas") if feedback == "Preocupante" else create_single_button(screen, font, "Sair")
-                            fade(screen, clock, fade_in=True)
-                elif phase == 1 and game_over:
-                    if feedback == "Preocupante" and btn_show_tips[0].collidepoint(event.pos):
-                        phase = 2
-                        fade(screen, clock, fade_in=False)
-                        fade(screen, clock, fade_in=True)
-                    elif feedback != "Preocupante" and btn_exit[0].collidepoint(event.pos):
-                        running = False
-                elif phase == 2 and btn_exit and btn_exit[0].collidepoint(event.pos):
-                    running = False
-
-        screen.fill(BG_COLOR if phase == 1 else TIP_BG)
-
-        if phase == 1 and not game_over:
-            draw_wrapped_text(screen, questions[current_q], 20, 20, font)
-            for stone in stones:
-                color_name = get_color_name(stone["color"])
-                img = pedra_imagens[color_name]
-                rect = img.get_rect(center=stone["center"])
-                screen.blit(img, rect)
-                draw_wrapped_text(screen, stone["label"], stone["center"][0] + 50, stone["center"][1] - 25, font, max_width=350)
-        elif game_over and phase == 1:
-            screen.blit(font.render("Questionário concluído!", True, FEEDBACK_COLOR), (250, 200))
-            screen.blit(font.render(f"Resultado: {feedback}", True, FEEDBACK_COLOR), (250, 240))
-            y = 300
-            for cor, count in click_counter.items():
-                screen.blit(font.render(f"{cor}: {count} vez(es)", True, TEXT_COLOR), (250, y))
-                y += 30
-            rect, text = btn_show_tips if feedback == "Preocupante" else btn_exit
-            pygame.draw.rect(screen, (3, 218, 197), rect, border_radius=8)
-            pygame.draw.rect(screen, TEXT_COLOR, rect, 2, border_radius=8)
-            draw_wrapped_text(screen, text, rect.x + 30, rect.y + 10, font)
-        elif phase == 2:
-            draw_wrapped_text(screen, "Dicas para melhorar:", 20, 20, font, color=TIP_TEXT)
-            y = 80
-            for tip in tips:
-                draw_wrapped_text(screen, tip, 40, y, font, color=TIP_TEXT)
-                y += font.get_linesize() + 10
-            if not btn_exit:
-                btn_exit = create_single_button(screen, font, "Sair")
-            rect, text = btn_exit
-            pygame.draw.rect(screen, (3, 218, 197), rect, border_radius=8)
-            pygame.draw.rect(screen, TEXT_COLOR, rect, 2, border_radius=8)
-            draw_wrapped_text(screen, text, rect.x + 60, rect.y + 10, font)
+    def start(self):
+        route(*[(stone, lambda s=stone: self.choose(s)) for stone in self.stones])
 
-        pygame.display.flip()
-        clock.tick(60)
+    def choose(self, stone):
+        global last_result
+        font = self.font
+        self.transition.start()
+        self.answers.append(stone.index)
+        click_counter[stone.color_name] += 1
+        self.current_q += 1
+        if self.current_q >= len(self.questions):
+            self.game_over = True
+            self.feedback = feedback = self.stone_test.feedback(self.answers)
+            last_result = {"respostas": list(self.answers), "resultado": feedback, "cliques": dict(click_counter)}
+            STORE.save({
+                "sessao": self.session_id,
+                "jogo": "pedras_teste",
+                "questionario": "pedras",
+                "pontuacao": self.stone_test.score(self.answers),
+                "categoria": feedback,
+                "respostas": self.answers,
+                "cliques": last_result["cliques"],
+            })
+            self.result_labels = [
+                wrapped_label("Questionário concluído!", font, (250, 200), FEEDBACK_COLOR),
+                wrapped_label(f"Resultado: {feedback}", font, (250, 240), FEEDBACK_COLOR),
+            ] + [
+                wrapped_label(f"{cor}: {count} vez(es)", font, (250, 300 + i * 30))
+                for i, (cor, count) in enumerate(click_counter.items())
+            ]
+            if feedback == "Preocupante":
+                self.btn_show_tips = create_single_button(self.screen, font, "Ver Dicas")
+                route((self.btn_show_tips, self.show_tips))
+            else:
+                self.btn_exit = create_single_button(self.screen, font, "Sair")
+                route((self.btn_exit, self.leave))
+        else:
+            self.question_label.set_text(self.questions[self.current_q])
+
+    def show_tips(self):
+        self.transition.start()
+        self.phase = 2
+        self.btn_exit = create_single_button(self.screen, self.font, "Sair", label_x=60)
+        route((self.btn_exit, self.leave))
+
+    def leave(self):
+        self.running = False
+
+    def draw(self):
+        """Desenha a tela atual; devolve se a transição ainda está em curso."""
+        screen = self.screen
+        font = self.font
+        if self.phase == 1 and not self.game_over:
+            draw_stone_screen(screen, self.batch, self.question_label, self.stones)
+        elif self.game_over and self.phase == 1:
+            screen.fill(BG_COLOR)
+            for label in self.result_labels:
+                label.draw(screen)
+            (self.btn_show_tips if self.feedback == "Preocupante" else self.btn_exit).draw(screen)
+        elif self.phase == 2:
+            screen.fill(TIP_BG)
+            if not self.tip_labels:
+                self.tip_labels.append(wrapped_label("Dicas para melhorar:", font, (20, 20), TIP_TEXT))
+                for i, tip in enumerate(self.stone_test.tips):
+                    self.tip_labels.append(wrapped_label(tip, font, (40, 80 + i * (font.get_linesize() + 10)), TIP_TEXT))
+            for label in self.tip_labels:
+                label.draw(screen)
+            self.btn_exit.draw(screen)
+        return self.transition.apply()
+
+def session_results():
+    return last_result
+
+def reset_session():
+    # Contagem e resultado são de um participante; atlas, fontes e textos ficam em cache
+    global last_result
+    for color in click_counter:
+        click_counter[color] = 0
+    last_result = None
+
+def run_session(screen, scheduler, game):
+    game.start()
+    while game.running:
+        events = scheduler.events()
+        TRACER.received(scheduler, game.phase_name)
+        PROFILER.begin(game.phase_name)
+        with PROFILER.stage("eventos"):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    pygame.quit(); sys.exit()
+                ROUTER.dispatch(event)
+
+        with PROFILER.stage("desenho"):
+            if game.draw():
+                scheduler.keep_active()
+        PROFILER.draw_overlay(screen)
+        with PROFILER.stage("flip"):
+            pygame.display.flip()
+        TRACER.presented()
+        PROFILER.end()
+    TRACER.discard()
+
+def main():
+    screen = init_pygame((800, 600), "Pedras Mágicas - Jornada Interior")
+    scheduler = scheduler_from_env(60, "pedras_teste")
+    font = FONTS.get('Arial', 22)
+    enable_from_env()
+    enable_tracing()
+    enable_results()
+    enable_analytics()
+    build_atlas()
+    TIMER.mark('recursos')
+    preloader = Preloader(preload_tasks(font))
+    welcome_screen(screen, scheduler, font, preloader)
+    loaded = wait_with_progress(screen, scheduler, preloader, font, BG_COLOR, TEXT_COLOR, BUTTON_COLOR)
+    transition = Transition(screen, duration=400)
+
+    stone_test = loaded["stone_test"]
+    run_session(screen, scheduler, StoneGame(screen, font, stone_test, transition))
+    while KIOSK:
+        reset_session()
+        transition.finish()
+        welcome_screen(screen, scheduler, font)
+        run_session(screen, scheduler, StoneGame(screen, font, stone_test, transition))
 
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
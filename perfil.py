@@ -0,0 +1,202 @@
+"""Perfil de tempo por quadro, separado por fase, com sobreposição na tela.
+
+Etapas medidas: eventos, desenho, texto (renderização de linhas, contida em
+desenho) e flip. Cada fase guarda os últimos quadros num buffer circular.
+
+Ativação: JOGOS_PERFIL=1 liga a medição (F3 mostra/esconde a sobreposição);
+JOGOS_PERFIL=<arquivo.json> faz o mesmo e grava os buffers ao sair. Desligado,
+cada ponto de medição custa só uma chamada que devolve um contexto vazio.
+"""
+import atexit
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+
+import pygame
+
+from recursos import FONTS, FREETYPE_LOCK
+from texto import TEXT_CACHE
+
+STAGES = ('eventos', 'desenho', 'texto', 'flip')
+
+_NULL = contextlib.nullcontext()
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, (time.perf_counter() - self.start) * 1000)
+
+
+class FrameProfiler:
+    """Tempos (ms) de cada quadro: (total, eventos, desenho, texto, flip) por fase."""
+    def __init__(self, size=240):
+        self.size = size
+        self.enabled = False
+        self.visible = False
+        self.frames = {}
+        self._phase = None
+        self._start = 0.0
+        self._stages = dict.fromkeys(STAGES, 0.0)
+        self._main_thread = threading.get_ident()
+        self._cache = None
+        self._font = None
+
+    def enable(self, cache=TEXT_CACHE):
+        """Liga a medição e passa a cronometrar o backend de texto de `cache`."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._cache = cache
+        render_line = cache.render_line
+
+        def timed_line(text, font, color):
+            start = time.perf_counter()
+            surf = render_line(text, font, color)
+            # A pré-carga também renderiza texto, mas fora dos quadros da thread principal
+            if threading.get_ident() == self._main_thread:
+                self.add('texto', (time.perf_counter() - start) * 1000)
+            return surf
+
+        timed_line.original = render_line
+        cache.render_line = timed_line
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        self.visible = False
+        self._cache.render_line = self._cache.render_line.original
+
+    def begin(self, phase):
+        """Início de um quadro atribuído à fase `phase` (nome)."""
+        if not self.enabled:
+            return
+        self._phase = phase
+        for stage in STAGES:
+            self._stages[stage] = 0.0
+        self._start = time.perf_counter()
+
+    def stage(self, name):
+        """with profiler.stage('desenho'): ... soma o tempo do bloco à etapa."""
+        if not self.enabled:
+            return _NULL
+        return _Stage(self, name)
+
+    def add(self, stage, ms):
+        self._stages[stage] += ms
+
+    def end(self):
+        if not self.enabled or self._phase is None:
+            return
+        total = (time.perf_counter() - self._start) * 1000
+        frames = self.frames.get(self._phase)
+        if frames is None:
+            frames = self.frames[self._phase] = collections.deque(maxlen=self.size)
+        frames.append((total,) + tuple(self._stages[s] for s in STAGES))
+        self._phase = None
+
+    def summary(self, phase):
+        """Percentis p50/p95/p99 do total e p50 de cada etapa."""
+        frames = self.frames.get(phase, ())
+        totals = sorted(f[0] for f in frames)
+        result = {
+            'quadros': len(frames),
+            'p50': percentile(totals, 0.50),
+            'p95': percentile(totals, 0.95),
+            'p99': percentile(totals, 0.99),
+        }
+        for i, stage in enumerate(STAGES, 1):
+            result[stage] = percentile(sorted(f[i] for f in frames), 0.50)
+        return result
+
+    # --- sobreposição ---
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def bind(self, router, on_toggle=None):
+        """Registra F3 no roteador da tela atual; on_toggle repinta o que a sobreposição cobria."""
+        if not self.enabled:
+            return
+
+        def toggle():
+            self.toggle()
+            if on_toggle:
+                on_toggle()
+        router.on_key(pygame.K_F3, toggle)
+
+    def draw_overlay(self, screen, phase=None, spark_ms=1000 / 30):
+        """Desenha o painel se visível; devolve a lista de retângulos alterados."""
+        if not self.visible:
+            return []
+        phase = phase or self._phase or next(iter(self.frames), None)
+        if self._font is None:
+            self._font = FONTS.get('Arial', 14)
+        s = self.summary(phase)
+        lines = [
+            f"{phase}  ({s['quadros']} quadros)",
+            f"total p50 {s['p50']:.2f}  p95 {s['p95']:.2f}  p99 {s['p99']:.2f} ms",
+            '  '.join(f"{stage} {s[stage]:.2f}" for stage in STAGES),
+        ]
+        line_h = self._font.get_linesize()
+        spark_h = 30
+        rect = pygame.Rect(0, 0, 320, len(lines) * line_h + spark_h + 12)
+        rect.topright = (screen.get_width() - 4, 4)
+        screen.fill((0, 0, 0), rect)
+        with FREETYPE_LOCK:
+            for i, line in enumerate(lines):
+                screen.blit(self._font.render(line, True, (230, 230, 230)), (rect.x + 6, rect.y + 4 + i * line_h))
+        # Linha de base e uma barra por quadro; a escala cheia é o orçamento de um quadro
+        base = rect.bottom - 6
+        frames = list(self.frames.get(phase, ()))[-(rect.width - 12) // 2:]
+        for i, f in enumerate(frames):
+            h = max(1, min(spark_h, round(f[0] / spark_ms * spark_h)))
+            color = (80, 200, 120) if f[0] < spark_ms / 2 else (230, 200, 60) if f[0] < spark_ms else (230, 70, 70)
+            x = rect.x + 6 + i * 2
+            pygame.draw.line(screen, color, (x, base), (x, base - h))
+        return [rect]
+
+    # --- gravação ---
+
+    def dump(self, path):
+        data = {
+            'etapas': ['total'] + list(STAGES),
+            'fases': {
+                phase: {'resumo': self.summary(phase), 'quadros': [list(f) for f in frames]}
+                for phase, frames in self.frames.items()
+            },
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+
+
+PROFILER = FrameProfiler()
+
+
+def enable_from_env():
+    """Liga o perfil conforme JOGOS_PERFIL; devolve se ligou."""
+    target = os.environ.get('JOGOS_PERFIL')
+    if not target:
+        return False
+    PROFILER.enable()
+    if target != '1':
+        atexit.register(PROFILER.dump, target)
+    return True
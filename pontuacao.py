@@ -0,0 +1,140 @@
+"""Pontuação em lote dos questionários com NumPy, sem pygame, usando as definições compiladas.
+
+Uso na linha de comando:
+    python pontuacao.py avaliacoes respostas.csv resultados.csv
+    python pontuacao.py pedras respostas.csv resultados.csv --chunk 50000
+
+Cada linha do CSV de entrada tem um identificador seguido das respostas, na
+ordem de avaliacoes.json: 15 valores 0-4 (Depressão, Ansiedade e Estresse, 5 de
+cada) em `avaliacoes`, ou 21 índices de opção 0-3 em `pedras`. A primeira linha
+é o cabeçalho.
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+import tempfile
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from avaliacoes import load_definitions
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("A pontuação em lote precisa do NumPy (pip install numpy)")
+
+
+def score_assessments(responses, assessment):
+    """responses: matriz (n, perguntas) de valores; devolve totais e nomes das categorias."""
+    _require_numpy()
+    responses = np.asarray(responses)
+    if responses.size and (responses.min() < 0 or responses.max() >= assessment.option_values):
+        raise ValueError(f"respostas fora do intervalo 0-{assessment.option_values - 1}")
+    totals = responses.sum(axis=1)
+    # Mesmo vetor denso compilado que o jogo consulta em AssessmentPhase._finish
+    names = np.array(assessment.names)
+    table = np.asarray(assessment.table, dtype=np.int8)
+    return totals, names[table[totals]]
+
+
+def score_stones(answers, stones):
+    """answers: matriz (n, perguntas) de índices de opção; devolve médias e resultados."""
+    _require_numpy()
+    answers = np.asarray(answers)
+    if answers.size and (answers.min() < 0 or answers.max() >= len(stones.scores)):
+        raise ValueError(f"opções fora do intervalo 0-{len(stones.scores) - 1}")
+    avg = np.asarray(stones.scores)[answers].sum(axis=1) / len(stones.questions)
+    labels = np.where(avg >= stones.threshold, "Preocupante", "Não preocupante")
+    return avg, labels
+
+
+def _chunks(reader, size):
+    while True:
+        rows = list(itertools.islice(reader, size))
+        if not rows:
+            return
+        yield rows
+
+
+def score_csv(mode, src, dst, chunk=10000, defs=None):
+    """Lê src em blocos de `chunk` linhas, pontua cada bloco e grava em dst; devolve o total."""
+    _require_numpy()
+    defs = defs or load_definitions()
+    reader = csv.reader(src)
+    writer = csv.writer(dst)
+    next(reader, None)
+    if mode == 'avaliacoes':
+        header = ['id']
+        for a in defs.assessments:
+            header += [f'{a.title}_total', f'{a.title}_categoria']
+        n_answers = sum(len(a.questions) for a in defs.assessments)
+    else:
+        header = ['id', 'media', 'resultado']
+        n_answers = len(defs.stones.questions)
+    writer.writerow(header)
+    count = 0
+    for rows in _chunks(reader, chunk):
+        ids = [r[0] for r in rows]
+        # Linha do arquivo (o cabeçalho é a 1) da primeira linha inválida do bloco
+        for i, r in enumerate(rows, count + 2):
+            if len(r) != n_answers + 1:
+                raise ValueError(f"linha {i}: cada linha deve ter um id e {n_answers} respostas")
+            if not all(v.strip().isdigit() for v in r[1:]):
+                raise ValueError(f"linha {i}: respostas devem ser inteiros não negativos")
+        values = np.array([r[1:] for r in rows], dtype=np.int16)
+        if mode == 'avaliacoes':
+            columns = []
+            start = 0
+            for a in defs.assessments:
+                block = values[:, start:start + len(a.questions)]
+                start += len(a.questions)
+                columns.extend(score_assessments(block, a))
+            writer.writerows(zip(ids, *columns))
+        else:
+            avg, labels = score_stones(values, defs.stones)
+            writer.writerows(zip(ids, avg.round(4), labels))
+        count += len(rows)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pontua respostas em lote a partir de CSV.")
+    parser.add_argument('modo', choices=['avaliacoes', 'pedras'])
+    parser.add_argument('entrada', help="CSV de entrada ('-' para stdin)")
+    parser.add_argument('saida', help="CSV de saída ('-' para stdout)")
+    parser.add_argument('--chunk', type=int, default=10000, help="linhas por bloco")
+    args = parser.parse_args(argv)
+
+    try:
+        src = sys.stdin if args.entrada == '-' else open(args.entrada, newline='', encoding='utf-8')
+    except OSError as exc:
+        parser.error(str(exc))
+    if args.saida == '-':
+        dst = sys.stdout
+    else:
+        # Só vira `saida` no fim: um erro no meio não deixa um CSV pela metade no lugar
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(args.saida)), suffix='.tmp')
+        dst = os.fdopen(fd, 'w', newline='', encoding='utf-8')
+    try:
+        count = score_csv(args.modo, src, dst, args.chunk)
+    except ValueError as exc:
+        if dst is not sys.stdout:
+            dst.close()
+            os.remove(tmp)
+        parser.error(str(exc))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+    if dst is not sys.stdout:
+        dst.close()
+        os.replace(tmp, args.saida)
+    print(f"{count} resposta(s) pontuada(s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Pré-carga em segundo plano enquanto a tela de boas-vindas é exibida.
+
+As tarefas rodam em ordem numa única thread. Texto e fontes passam pela
+FREETYPE_LOCK de recursos, e o atlas troca superfície e retângulos de uma vez,
+então a thread principal pode continuar desenhando a tela inicial.
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from texto import TEXT_CACHE, layout_paragraphs
+
+
+class Preloader:
+    """Executa tarefas (nome, função) numa thread e expõe o resultado como um Future."""
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+        self.done = 0
+        self.future = None
+
+    @property
+    def total(self):
+        return len(self.tasks)
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.tasks else 1.0
+
+    def start(self):
+        """Dispara a carga; chamadas repetidas devolvem o mesmo Future."""
+        if self.future is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='precarga')
+            self.future = executor.submit(self._run)
+            # A thread termina sozinha ao fim das tarefas
+            executor.shutdown(wait=False)
+        return self.future
+
+    def _run(self):
+        results = {}
+        for name, task in self.tasks:
+            results[name] = task()
+            self.done += 1
+        return results
+
+    def ready(self):
+        return self.future is not None and self.future.done()
+
+    def result(self):
+        """Resultados por nome de tarefa; repassa aqui qualquer exceção da thread."""
+        return self.start().result()
+
+
+def wait_with_progress(screen, scheduler, preloader, font, bg_color, fg_color, bar_color):
+    """Se a carga ainda não terminou, mostra uma barra de progresso até terminar."""
+    preloader.start()
+    if scheduler.virtual:
+        # Na reprodução o tempo de carga não pode deslocar os eventos gravados
+        return preloader.result()
+    width, height = screen.get_size()
+    bar = pygame.Rect(0, 0, width // 2, 20)
+    bar.center = (width // 2, height // 2 + 30)
+    scheduler.loading = True
+    while not preloader.ready():
+        screen.fill(bg_color)
+        label = TEXT_CACHE.render("Carregando...", font, fg_color, width, layout_paragraphs)
+        screen.blit(label, label.get_rect(midbottom=(width // 2, bar.top - 10)))
+        pygame.draw.rect(screen, fg_color, bar, 2)
+        fill = bar.inflate(-6, -6)
+        fill.width = round(fill.width * preloader.progress)
+        pygame.draw.rect(screen, bar_color, fill)
+        pygame.display.flip()
+        # A barra precisa avançar mesmo sem eventos de entrada
+        scheduler.keep_active()
+        for event in scheduler.events():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+    scheduler.loading = False
+    return preloader.result()
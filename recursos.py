@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import pygame
+
+# Fontes usadas pelos dois jogos: (família, tamanho, negrito)
+UI_FONTS = [
+    ('Arial', 22, False),
+    ('Arial', 24, False),
+    ('Arial', 30, True),
+    ('Arial', 36, True),
+]
+
+# Imagens usadas pelos dois jogos: (arquivo, tamanho, smoothscale)
+GAME_IMAGES = [
+    ('bruxo.png', (180, 250), True),
+    ('bruxo.png', (180, 250), False),
+    ('pedra_amarela.png', (60, 60), False),
+    ('pedra_verde.png', (60, 60), False),
+    ('pedra_azul.png', (60, 60), False),
+    ('pedra_vermelha.png', (60, 60), False),
+]
+
+ASSET_CACHE_DIR = '.asset_cache'
+
+# SDL_ttf/FreeType não é seguro entre threads: toda carga, medida e renderização de
+# texto feita enquanto a pré-carga roda em segundo plano passa por esta trava
+FREETYPE_LOCK = threading.RLock()
+
+
+class FontRegistry:
+    """Carrega cada (família, tamanho, negrito) uma única vez e compartilha a instância."""
+    def __init__(self):
+        self._fonts = {}
+        self.lookups = 0
+        self.loads = 0
+
+    def get(self, family, size, bold=False):
+        self.lookups += 1
+        key = (family, size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._load(key)
+        return font
+
+    def _load(self, key):
+        with FREETYPE_LOCK:
+            font = self._fonts.get(key)
+            if font is None:
+                self.loads += 1
+                family, size, bold = key
+                font = self._fonts[key] = pygame.font.SysFont(family, size, bold=bold)
+        return font
+
+    def preload(self, specs=UI_FONTS):
+        """Carrega de antemão as fontes conhecidas (sem contar como consultas)."""
+        for spec in specs:
+            if spec not in self._fonts:
+                self._load(tuple(spec))
+
+    def stats(self):
+        return {'lookups': self.lookups, 'loads': self.loads, 'fonts': len(self._fonts)}
+
+    def clear(self):
+        self._fonts.clear()
+
+
+def _file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _replace_atomically(path, data):
+    """Grava num temporário de nome único na mesma pasta e troca de uma vez.
+
+    Uma gravação interrompida (queda de energia no quiosque) deixa no máximo um
+    .tmp órfão, que prune() apaga; o arquivo de destino nunca fica pela metade.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _decode(path, size, smooth):
+    img = pygame.image.load(path).convert_alpha()
+    if size:
+        scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        img = scale(img, size)
+    return img
+
+
+class ImageCache:
+    """Cache em disco de imagens já redimensionadas, em pixels RGBA crus, indexado pelo hash do PNG."""
+    def __init__(self, cache_dir=ASSET_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, 'manifest.json')
+        self._manifest = None
+
+    @property
+    def manifest(self):
+        """Lido do disco só no primeiro uso, não na importação do módulo."""
+        if self._manifest is None:
+            try:
+                with open(self.manifest_path) as f:
+                    self._manifest = json.load(f)
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    @staticmethod
+    def _key(path, size, smooth):
+        w, h = size or (0, 0)
+        return f"{os.path.normpath(path)}|{w}x{h}|{'smooth' if smooth else 'scale'}"
+
+    def _entry(self, path, size, smooth):
+        """Entrada válida do manifesto para o PNG atual, ou None se o conteúdo mudou."""
+        entry = self.manifest.get(self._key(path, size, smooth))
+        if entry is None:
+            return None
+        st = os.stat(path)
+        if (entry['mtime'], entry['bytes']) != (st.st_mtime_ns, st.st_size):
+            # Só relê o PNG inteiro quando data ou tamanho mudaram
+            if _file_hash(path) != entry['sha1']:
+                return None
+            entry['mtime'], entry['bytes'] = st.st_mtime_ns, st.st_size
+        if not os.path.exists(os.path.join(self.cache_dir, entry['file'])):
+            return None
+        return entry
+
+    def load(self, path, size=None, smooth=True):
+        entry = self._entry(path, size, smooth)
+        if entry is not None:
+            with open(os.path.join(self.cache_dir, entry['file']), 'rb') as f:
+                data = f.read()
+            try:
+                img = pygame.image.frombytes(data, tuple(entry['size']), 'RGBA')
+            except ValueError:
+                # Arquivo truncado ou trocado: decodifica o PNG e regrava abaixo
+                img = None
+            if img is not None:
+                return img.convert_alpha()
+        img = _decode(path, size, smooth)
+        try:
+            self.store(path, size, smooth, img)
+        except OSError:
+            # Cache é opcional: disco somente leitura não impede o jogo
+            pass
+        return img
+
+    def store(self, path, size, smooth, img):
+        """Grava os pixels já redimensionados com nome derivado do conteúdo do PNG."""
+        sha1 = _file_hash(path)
+        w, h = img.get_size()
+        name = f"{sha1[:16]}_{w}x{h}_{'smooth' if smooth else 'scale'}.rgba"
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Sempre regravado numa falta: um arquivo de mesmo nome pode ser resto de uma gravação interrompida
+        _replace_atomically(os.path.join(self.cache_dir, name), pygame.image.tobytes(img, 'RGBA'))
+        st = os.stat(path)
+        self.manifest[self._key(path, size, smooth)] = {
+            'sha1': sha1, 'mtime': st.st_mtime_ns, 'bytes': st.st_size,
+            'file': name, 'size': [w, h],
+        }
+        self.save()
+
+    def is_fresh(self, path, size=None, smooth=True):
+        return self._entry(path, size, smooth) is not None
+
+    def prune(self):
+        """Apaga arquivos do cache que o manifesto não referencia mais; devolve quantos."""
+        used = {e['file'] for e in self.manifest.values()} | {'manifest.json'}
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name not in used:
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+        return removed
+
+    def save(self):
+        _replace_atomically(self.manifest_path,
+                            json.dumps(self.manifest, indent=1, sort_keys=True).encode('utf-8'))
+
+
+# Registros compartilhados pelos dois jogos
+FONTS = FontRegistry()
+IMAGES = ImageCache()
@@ -0,0 +1,234 @@
+"""Resultados das sessões gravados em SQLite (modo WAL) por uma thread de escrita.
+
+O jogo só enfileira (ResultStore.save não bloqueia); a thread junta o que
+estiver na fila e grava tudo numa única transação, então um disco lento
+atrasa a gravação, não o quadro. Cada questionário concluído vira uma linha
+assim que o resultado é conhecido. A fila é esvaziada ao sair, inclusive por
+exceção ou SIGTERM.
+
+Ativação nos jogos: grava em resultados.db por padrão; JOGOS_RESULTADOS=<arquivo>
+muda o arquivo e JOGOS_RESULTADOS=0 desliga.
+
+Uso:
+    python resultados.py                     # resumo e últimas linhas
+    python resultados.py --banco outro.db --ultimos 20
+"""
+import argparse
+import atexit
+import json
+import os
+import queue
+import signal
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+DEFAULT_PATH = 'resultados.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resultados (
+    id INTEGER PRIMARY KEY,
+    sessao TEXT NOT NULL,
+    jogo TEXT NOT NULL,
+    questionario TEXT NOT NULL,
+    pontuacao REAL NOT NULL,
+    categoria TEXT NOT NULL,
+    respostas TEXT NOT NULL,
+    cliques TEXT,
+    criado REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resultados_criado ON resultados (criado);
+"""
+
+COLUMNS = ('sessao', 'jogo', 'questionario', 'pontuacao', 'categoria', 'respostas', 'cliques', 'criado')
+
+_INSERT = f"INSERT INTO resultados ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+# Marca de fim na fila da thread de escrita
+_STOP = object()
+
+
+def new_session_id():
+    return uuid.uuid4().hex
+
+
+def connect(path):
+    db = sqlite3.connect(path)
+    db.execute('PRAGMA journal_mode=WAL')
+    # Com WAL, NORMAL só perde a última transação numa queda de energia, nunca corrompe
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.executescript(SCHEMA)
+    return db
+
+
+def row(record):
+    """Linha da tabela a partir do registro de um questionário (respostas e cliques viram JSON)."""
+    cliques = record.get('cliques')
+    return (
+        record['sessao'],
+        record['jogo'],
+        record['questionario'],
+        record['pontuacao'],
+        record['categoria'],
+        json.dumps(list(record['respostas'])),
+        json.dumps(cliques, ensure_ascii=False) if cliques is not None else None,
+        record.get('criado', time.time()),
+    )
+
+
+class ResultStore:
+    """Fila limitada + thread de escrita com commits em grupo."""
+    def __init__(self, max_queue=256, batch=64, linger_ms=50):
+        self.max_queue = max_queue
+        self.batch = batch
+        self.linger_ms = linger_ms
+        self.path = None
+        self.queue = None
+        self.thread = None
+        self.dropped = 0
+        self.error = None
+        # listener(db, final) na thread de escrita após cada commit; final=True no encerramento
+        self.listeners = []
+
+    @property
+    def enabled(self):
+        return self.thread is not None
+
+    def open(self, path):
+        """Abre (ou cria) o banco e inicia a thread; erros de abertura aparecem aqui."""
+        if self.enabled:
+            return
+        connect(path).close()
+        self.path = path
+        self.queue = queue.Queue(self.max_queue)
+        # Daemon: o interpretador não espera por ela antes do atexit, que é quem a encerra
+        self.thread = threading.Thread(target=self._run, name='resultados', daemon=True)
+        self.thread.start()
+
+    def save(self, record):
+        """Enfileira sem bloquear; devolve False se a gravação está desligada ou a fila cheia."""
+        if not self.enabled:
+            return False
+        try:
+            self.queue.put_nowait(row(record))
+        except queue.Full:
+            self.dropped += 1
+            print(f"resultados: fila cheia, registro descartado ({self.dropped})", file=sys.stderr)
+            return False
+        return True
+
+    def close(self, timeout=10.0):
+        """Grava o que falta e encerra a thread; chamado no atexit.
+
+        Se a thread de escrita morreu ou travou (disco, banco bloqueado), ninguém
+        esvazia a fila: a saída espera no máximo `timeout` s pela fila e outro
+        tanto pela gravação, e avisa o que ficou sem gravar.
+        """
+        if not self.enabled:
+            return
+        thread, self.thread = self.thread, None
+        if not thread.is_alive():
+            print(f"resultados: thread de escrita encerrada, {self.queue.qsize()} registro(s) não gravados",
+                  file=sys.stderr)
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print(f"resultados: fila cheia ao sair, {self.queue.qsize()} registro(s) não gravados", file=sys.stderr)
+            return
+        thread.join(timeout)
+        if thread.is_alive():
+            print(f"resultados: gravação não terminou em {timeout:g} s, {self.queue.qsize()} registro(s) pendentes",
+                  file=sys.stderr)
+
+    def _run(self):
+        db = connect(self.path)
+        stop = False
+        while not stop:
+            rows = []
+            item = self.queue.get()
+            deadline = time.perf_counter() + self.linger_ms / 1000
+            # Junta o que chegar em seguida numa só transação
+            while True:
+                if item is _STOP:
+                    stop = True
+                else:
+                    rows.append(item)
+                if stop or len(rows) >= self.batch:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.perf_counter(), 0))
+                except queue.Empty:
+                    break
+            if rows:
+                self._write(db, rows)
+            if rows or stop:
+                self._notify(db, stop)
+            for _ in range(len(rows) + stop):
+                self.queue.task_done()
+        db.close()
+
+    def _write(self, db, rows):
+        try:
+            with db:
+                db.executemany(_INSERT, rows)
+        except sqlite3.Error as exc:
+            # Disco cheio ou banco travado: registra e segue, o jogo não pode parar por isso
+            self.error = exc
+            self.dropped += len(rows)
+            print(f"resultados: falha ao gravar {len(rows)} registro(s): {exc}", file=sys.stderr)
+
+    def _notify(self, db, final):
+        for listener in self.listeners:
+            try:
+                listener(db, final)
+            except Exception as exc:  # um consumidor com defeito não pode parar a gravação
+                print(f"resultados: falha em {listener!r}: {exc}", file=sys.stderr)
+
+
+STORE = ResultStore()
+
+
+def _terminate(signum, frame):
+    # SIGTERM vira SystemExit: o atexit roda e a fila é gravada
+    sys.exit(128 + signum)
+
+
+def enable_from_env():
+    """Abre STORE conforme JOGOS_RESULTADOS (padrão resultados.db); devolve se abriu."""
+    target = os.environ.get('JOGOS_RESULTADOS', DEFAULT_PATH)
+    if target == '0':
+        return False
+    try:
+        STORE.open(target)
+    except sqlite3.Error as exc:
+        print(f"JOGOS_RESULTADOS: não foi possível abrir {target}: {exc}", file=sys.stderr)
+        return False
+    atexit.register(STORE.close)
+    if threading.current_thread() is threading.main_thread() and signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+        signal.signal(signal.SIGTERM, _terminate)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumo dos resultados gravados pelos jogos.")
+    parser.add_argument('--banco', default=os.environ.get('JOGOS_RESULTADOS', DEFAULT_PATH), help="arquivo SQLite")
+    parser.add_argument('--ultimos', type=int, default=10, help="linhas mais recentes a listar")
+    args = parser.parse_args(argv)
+
+    db = connect(args.banco)
+    total, sessions = db.execute("SELECT COUNT(*), COUNT(DISTINCT sessao) FROM resultados").fetchone()
+    print(f"{total} questionário(s) em {sessions} sessão(ões)")
+    query = ("SELECT criado, jogo, questionario, pontuacao, categoria FROM resultados "
+             "ORDER BY id DESC LIMIT ?")
+    for created, game, name, score, category in db.execute(query, (args.ultimos,)):
+        print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(created))}  {game:<15}{name:<12}"
+              f"{score:>6g}  {category}")
+    db.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import time
+
+import pygame
+
+# Estados de ritmo
+ACTIVE = 'active'
+IDLE = 'idle'
+BACKGROUND = 'background'
+
+
+class VirtualClock:
+    """Relógio que só anda quando mandam (reprodução de sessões gravadas)."""
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def advance(self, ms):
+        self.now += ms
+
+
+# Relógio virtual em uso; None segue o tempo real
+VIRTUAL = None
+
+
+def use_clock(clock):
+    """Passa get_ticks() (e com ele transições e ritmo) para `clock`; None volta ao tempo real."""
+    global VIRTUAL
+    VIRTUAL = clock
+
+
+def get_ticks():
+    """Milissegundos monotônicos; não depende de pygame.init() ter iniciado o timer do SDL."""
+    if VIRTUAL is not None:
+        return int(VIRTUAL.now)
+    return int(time.perf_counter() * 1000)
+
+
+class FrameScheduler:
+    """Ritmo adaptativo: taxa cheia só com animação, espera bloqueante quando ocioso."""
+    def __init__(self, fps=30, idle_timeout=500, background_timeout=2000):
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.background_timeout = background_timeout
+        self.focused = True
+        self.minimized = False
+        self.frames = {ACTIVE: 0, IDLE: 0, BACKGROUND: 0}
+        self._active_until = 0
+        # Sem tempo real por trás (reprodução): quem espera carga não deve contar quadros
+        self.virtual = False
+        # Ligado pela barra de carregamento, que descarta a entrada
+        self.loading = False
+        # Janela (ms de perf_counter) em que chegaram os eventos da última leva:
+        # nenhum deles entrou na fila antes de `since` nem foi lido depois de `at`
+        self.since = self.at = time.perf_counter() * 1000
+        # O primeiro quadro de qualquer tela sai sem espera
+        self.keep_active()
+
+    @property
+    def state(self):
+        if self.minimized or not self.focused:
+            return BACKGROUND
+        if get_ticks() < self._active_until:
+            return ACTIVE
+        return IDLE
+
+    def keep_active(self, ms=None):
+        """Mantém a taxa cheia por ms milissegundos (padrão: o próximo quadro)."""
+        if ms is None:
+            ms = 1000 // self.fps + 1
+        self._active_until = max(self._active_until, get_ticks() + ms)
+
+    def events(self):
+        """Espera o próximo quadro conforme o estado atual e devolve os eventos pendentes."""
+        state = self.state
+        self.frames[state] += 1
+        self.clock.tick(self.fps)
+        since = self.at
+        if state == ACTIVE:
+            events = pygame.event.get()
+        else:
+            timeout = self.idle_timeout if state == IDLE else self.background_timeout
+            if not pygame.event.peek():
+                # Fila vazia: o que vier chegou durante a espera
+                since = time.perf_counter() * 1000
+            first = pygame.event.wait(timeout)
+            events = [] if first.type == pygame.NOEVENT else [first]
+            events.extend(pygame.event.get())
+        self.since, self.at = since, time.perf_counter() * 1000
+        for event in events:
+            self._track(event)
+        if events:
+            # A resposta a uma entrada aparece no quadro seguinte, sem esperar
+            self.keep_active()
+        return events
+
+    def _track(self, event):
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif event.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+        elif event.type == pygame.WINDOWMINIMIZED:
+            self.minimized = True
+        elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED):
+            self.minimized = False
+
+    def stats(self):
+        return {
+            'state': self.state,
+            'fps': round(self.clock.get_fps(), 1),
+            'frames': dict(self.frames),
+        }
@@ -0,0 +1,270 @@
+"""Simulador sem janela: joga sessões sintéticas nas máquinas de estado dos dois jogos.
+
+Cada sessão entra pelos mesmos caminhos da partida real: cliques e ENTER vão
+pelo ROUTER (PhaseManager.handle_event no parte2, rotas das pedras no
+StoneGame) e um quadro é desenhado após cada entrada, sem ritmo de quadros.
+As sessões são divididas em lotes entre processos; cada processo abre a sua
+janela no driver dummy.
+
+Tipos de sessão:
+    avaliacao  todas as combinações de respostas de cada avaliação (5^5 por avaliação)
+    completa   as três avaliações com respostas sorteadas, até o ENTER do agradecimento
+    pedras     respostas sorteadas no teste das pedras, até sair pelo botão "Sair"
+
+Situações: 'fim' quando a sessão terminou (PhaseManager.done ou o "Sair" das
+pedras), 'ok' quando a avaliação terminou e a sessão seguiria, 'falha' com a
+exceção.
+
+Uso:
+    python simulador.py                              # exaustivo + 2000 de cada sorteada
+    python simulador.py --sorteadas 10000 --processos 8 --semente 7
+    python simulador.py --tipos pedras --saida simulacao.json
+"""
+import argparse
+import collections
+import itertools
+import json
+import os
+import random
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+KINDS = ('avaliacao', 'completa', 'pedras')
+
+# Sessões por tarefa enviada a um processo
+CHUNK = 250
+
+# Avanço do relógio virtual antes de cada quadro: maior que qualquer transição,
+# então cada quadro já mostra a tela final (sem os blits do esmaecimento)
+FRAME_STEP_MS = 1000
+
+# Estado de cada processo, montado por _init_worker()
+_worker = None
+
+
+class Worker:
+    """Janela, jogos e definições de um processo do simulador."""
+    def __init__(self):
+        import parte2_oficial
+        import pedras_teste
+        from eventos import ROUTER
+        from ritmo import VirtualClock, use_clock
+        from transicao import Transition
+        self.p2 = parte2_oficial
+        self.pt = pedras_teste
+        self.router = ROUTER
+        # Nada chega pela fila do SDL: filtrá-la só custaria chamadas a set_blocked
+        ROUTER.filter_queue = False
+        self.clock = VirtualClock()
+        use_clock(self.clock)
+        self.screen = parte2_oficial.startup()
+        pedras_teste.build_atlas()
+        pedras_teste.build_game_atlas()
+        self.defs = parte2_oficial.load_definitions()
+        self.font_pt = parte2_oficial.FONTS.get('Arial', 22)
+        self.transition = Transition(self.screen, duration=400)
+        # Centro de cada botão de opção do parte2, na ordem das opções
+        manager = parte2_oficial.PhaseManager(self.screen)
+        manager.start()
+        self.option_centers = [btn.rect.center for btn in manager.phase.buttons]
+        # Sessão em curso: se ela falhar, o resultado já obtido ainda entra na contagem
+        self.manager = None
+        self.game = None
+
+    def frame(self, draw):
+        self.clock.advance(FRAME_STEP_MS)
+        return draw()
+
+    # --- parte2 ---
+
+    def assessment_session(self, answers, first=0):
+        """Responde `answers` a partir da avaliação `first`; devolve os resultados e se a sessão acabou."""
+        manager = self.manager = self.p2.PhaseManager(self.screen)
+        manager.current = first
+        manager.start()
+        self.frame(manager.draw)
+        per_assessment = len(manager.assessments[0].questions)
+        for i, answer in enumerate(answers):
+            manager.handle_event(_click(self.option_centers[answer]))
+            self.frame(manager.draw)
+            manager.idle(budget_ms=0)
+            if (i + 1) % per_assessment == 0:
+                # Tela de resultado: ENTER segue para a próxima avaliação
+                manager.handle_event(_key(pygame.K_RETURN))
+                self.frame(manager.draw)
+        if isinstance(manager.phase, self.p2.ThankYouPhase):
+            manager.handle_event(_key(pygame.K_RETURN))
+        return manager.results, manager.done
+
+    # --- pedras ---
+
+    def stone_session(self, answers):
+        pt = self.pt
+        pt.reset_session()
+        game = self.game = pt.StoneGame(self.screen, self.font_pt, self.defs.stones, self.transition)
+        game.start()
+        self.frame(game.draw)
+        for answer in answers:
+            self.router.dispatch(_click(game.stones[answer].rect.center))
+            self.frame(game.draw)
+        # Resultado: "Ver Dicas" leva às dicas, "Sair" (ou o das dicas) encerra
+        for _ in range(2):
+            if not game.running:
+                break
+            button = game.btn_show_tips if game.phase == 1 and game.feedback == "Preocupante" else game.btn_exit
+            self.router.dispatch(_click(button.rect.center))
+            self.frame(game.draw)
+        return game.feedback, not game.running
+
+
+def _click(pos):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
+
+
+def _key(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key)
+
+
+def _init_worker():
+    global _worker
+    _worker = Worker()
+
+
+def _crash(exc):
+    """Assinatura de uma falha: tipo, mensagem e a linha do jogo onde aconteceu."""
+    frames = [f for f in traceback.extract_tb(exc.__traceback__) if not f.filename.endswith('simulador.py')]
+    where = f"{os.path.basename(frames[-1].filename)}:{frames[-1].lineno}" if frames else '?'
+    return f"{type(exc).__name__}: {exc} ({where})"
+
+
+def run_chunk(kind, sessions):
+    """Joga um lote no processo atual; devolve (situação, resultados, falha) por sessão."""
+    if _worker is None:
+        _init_worker()
+    results = []
+    for session in sessions:
+        error = None
+        _worker.manager = _worker.game = None
+        try:
+            if kind == 'pedras':
+                _, done = _worker.stone_session(session)
+            else:
+                first, answers = session
+                _, done = _worker.assessment_session(answers, first)
+            status = 'fim' if done else 'ok'
+        except Exception as exc:  # o simulador existe para encontrar estas falhas
+            status, error = 'falha', _crash(exc)
+        if kind == 'pedras':
+            data = _worker.game.feedback if _worker.game else None
+        else:
+            data = [list(r) for r in _worker.manager.results] if _worker.manager else []
+        results.append((status, data, error))
+    return kind, results
+
+
+def plan(kinds, samples, seed, defs):
+    """Lotes (tipo, [sessões]) a distribuir entre os processos."""
+    rng = random.Random(seed)
+    assessments = defs.assessments
+    options = assessments[0].option_values
+    jobs = []
+    if 'avaliacao' in kinds:
+        for first, assessment in enumerate(assessments):
+            paths = itertools.product(range(options), repeat=len(assessment.questions))
+            jobs.extend(('avaliacao', [(first, p) for p in chunk]) for chunk in _chunks(paths))
+    if 'completa' in kinds:
+        total = sum(len(a.questions) for a in assessments)
+        paths = ((0, tuple(rng.randrange(options) for _ in range(total))) for _ in range(samples))
+        jobs.extend(('completa', chunk) for chunk in _chunks(paths))
+    if 'pedras' in kinds:
+        stones = defs.stones
+        paths = (tuple(rng.randrange(len(stones.options)) for _ in stones.questions) for _ in range(samples))
+        jobs.extend(('pedras', chunk) for chunk in _chunks(paths))
+    return jobs
+
+
+def _chunks(iterable, size=CHUNK):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def summarize(outcomes):
+    """Contagens por tipo: situações, falhas por assinatura e distribuição de resultados.
+
+    Sessões que falharam contam nos resultados com o que chegaram a calcular.
+    """
+    report = {}
+    for kind, results in outcomes.items():
+        status = collections.Counter(s for s, _, _ in results)
+        crashes = collections.Counter(error for _, _, error in results if error)
+        scores = collections.defaultdict(collections.Counter)
+        for _, data, _ in results:
+            if kind == 'pedras':
+                if data:
+                    scores['resultado'][data] += 1
+            else:
+                for title, _, category, _ in data:
+                    scores[title][category] += 1
+        report[kind] = {
+            'sessoes': len(results),
+            'situacao': dict(status),
+            'falhas': dict(crashes.most_common()),
+            'resultados': {name: dict(counter.most_common()) for name, counter in scores.items()},
+        }
+    return report
+
+
+def simulate(kinds=KINDS, samples=2000, seed=0, processes=None):
+    from avaliacoes import load_definitions
+    jobs = plan(kinds, samples, seed, load_definitions())
+    outcomes = collections.defaultdict(list)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as pool:
+        for kind, results in pool.map(run_chunk, *zip(*jobs)) if jobs else ():
+            outcomes[kind].extend(results)
+    elapsed = time.perf_counter() - start
+    sessions = sum(len(r) for r in outcomes.values())
+    return {
+        'sessoes': sessions,
+        'segundos': elapsed,
+        'sessoes_por_segundo': sessions / elapsed if elapsed else 0.0,
+        'processos': processes or os.cpu_count(),
+        'semente': seed,
+        'tipos': summarize(outcomes),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Joga sessões sintéticas sem janela e procura falhas.")
+    parser.add_argument('--tipos', nargs='+', choices=KINDS, default=list(KINDS), help="tipos de sessão")
+    parser.add_argument('--sorteadas', type=int, default=2000, help="sessões sorteadas de 'completa' e 'pedras'")
+    parser.add_argument('--processos', type=int, help="processos (padrão: um por CPU)")
+    parser.add_argument('--semente', type=int, default=0, help="semente do sorteio")
+    parser.add_argument('--saida', help="grava o relatório completo em JSON")
+    args = parser.parse_args(argv)
+
+    report = simulate(args.tipos, args.sorteadas, args.semente, args.processos)
+    print(f"{report['sessoes']} sessões em {report['segundos']:.1f} s "
+          f"({report['sessoes_por_segundo']:.0f}/s, {report['processos']} processos)")
+    for kind, r in report['tipos'].items():
+        print(f"\n[{kind}] {r['sessoes']} sessões: "
+              + ', '.join(f"{status} {n}" for status, n in sorted(r['situacao'].items())))
+        for signature, n in r['falhas'].items():
+            print(f"  falha x{n}: {signature}")
+        for name, counts in r['resultados'].items():
+            print(f"  {name}: " + ', '.join(f"{category} {n}" for category, n in counts.items()))
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 1 if any(r['falhas'] for r in report['tipos'].values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
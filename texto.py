@@ -0,0 +1,217 @@
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+from recursos import FREETYPE_LOCK
+
+
+def freetype_line(text, font, color):
+    """Backend padrão: uma linha renderizada pelo SDL_ttf."""
+    return font.render(text, True, color)
+
+
+class TextCache:
+    """Cache LRU de blocos de texto já quebrados e renderizados numa única superfície."""
+    def __init__(self, max_size=128, render_line=freetype_line):
+        self.max_size = max_size
+        # render_line(text, font, color) -> Surface de uma linha
+        self.render_line = render_line
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, text, font, color, wrap_width, layout):
+        """Devolve a superfície do bloco; `layout(text, font, wrap_width)` gera um TextLayout."""
+        key = (text, font, tuple(color), wrap_width, layout)
+        with FREETYPE_LOCK:
+            surf = self._surfaces.get(key)
+            if surf is not None:
+                self.hits += 1
+                self._surfaces.move_to_end(key)
+                return surf
+            self.misses += 1
+            surf = self._build(layout(text, font, wrap_width), font, color)
+            self._surfaces[key] = surf
+            if len(self._surfaces) > self.max_size:
+                self._surfaces.popitem(last=False)
+                self.evictions += 1
+            return surf
+
+    def line(self, text, font, color):
+        """Uma linha pelo backend atual, sem passar pelo cache de blocos."""
+        with FREETYPE_LOCK:
+            return self.render_line(text, font, color)
+
+    def _build(self, layout, font, color):
+        rendered = [(self.render_line(line, font, color), pos) for line, pos in layout.positions() if line]
+        # A soma das larguras das palavras ignora o kerning; o bloco usa a medida real
+        width = max((s.get_width() for s, _ in rendered), default=0)
+        height = max((pos[1] + s.get_height() for s, pos in rendered), default=0)
+        block = pygame.Surface((max(width, 1), max(height, 1)), pygame.SRCALPHA)
+        # Fundo transparente na mesma cor do texto para não escurecer o antialiasing
+        block.fill((*color[:3], 0))
+        for s, pos in rendered:
+            block.blit(s, pos)
+        return block
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._surfaces),
+        }
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+class FontMetrics:
+    """Larguras de palavras de uma fonte, medidas uma única vez."""
+    def __init__(self, font):
+        self.font = font
+        self.space = font.size(' ')[0]
+        self.line_height = font.get_linesize()
+        self._widths = {}
+
+    def width(self, word):
+        w = self._widths.get(word)
+        if w is None:
+            w = self._widths[word] = self.font.size(word)[0]
+        return w
+
+    def measure(self, text):
+        """Largura real de uma linha inteira (sem memorizar)."""
+        return self.font.size(text)[0]
+
+
+_metrics = weakref.WeakKeyDictionary()
+
+
+def metrics_for(font):
+    """Devolve as métricas compartilhadas da fonte."""
+    m = _metrics.get(font)
+    if m is None:
+        m = _metrics[font] = FontMetrics(font)
+    return m
+
+
+class TextLayout:
+    """Resultado da quebra de linhas: textos, larguras e deslocamentos verticais."""
+    def __init__(self, lines, widths, offsets, line_height):
+        self.lines = lines
+        self.widths = widths
+        self.offsets = offsets
+        self.line_height = line_height
+        self.width = max(widths, default=0)
+        self.height = offsets[-1] + line_height if offsets else 0
+
+    def positions(self, x=0, y=0, align='left', box_width=None):
+        """Gera (linha, (x, y)) alinhando à esquerda, ao centro ou à direita de box_width."""
+        box_width = self.width if box_width is None else box_width
+        for line, w, dy in zip(self.lines, self.widths, self.offsets):
+            if align == 'center':
+                lx = x + (box_width - w) // 2
+            elif align == 'right':
+                lx = x + box_width - w
+            else:
+                lx = x
+            yield line, (lx, y + dy)
+
+    def clip(self, max_height):
+        """Novo layout só com as linhas que cabem inteiras em max_height."""
+        n = sum(1 for dy in self.offsets if dy + self.line_height <= max_height)
+        return TextLayout(self.lines[:n], self.widths[:n], self.offsets[:n], self.line_height)
+
+
+def _break_words(words, m, max_width, trailing_space, lines, widths, offsets, y):
+    """Quebra gulosa em tempo linear somando larguras memorizadas das palavras.
+
+    A soma erra por kerning e arredondamento (até ~1 px por palavra, mais no
+    negrito sintético), então cada quebra é confirmada medindo a linha real:
+    se a palavra cabe de fato ela entra, e se a linha já passou do limite as
+    últimas palavras voltam para a seguinte. São poucas medidas por linha.
+    """
+    def measure(line):
+        # Mesma regra do "line + word + ' '": o espaço final conta na medida
+        return m.measure(' '.join(line) + (' ' if trailing_space else ''))
+
+    line = []
+    line_w = 0
+    # Palavras iniciais da linha que já cabem de fato (ou que abrem a linha e ficam nela)
+    settled = 0
+    i = 0
+    while True:
+        if i < len(words):
+            word = words[i]
+            w = m.width(word)
+            if trailing_space:
+                candidate = line_w + w + m.space
+            else:
+                candidate = line_w + (m.space if line else 0) + w
+            if candidate > max_width:
+                # A estimativa manda quebrar: confirma com a linha real
+                real = measure(line + [word])
+                if real <= max_width:
+                    candidate = real
+                    settled = len(line) + 1
+            if candidate <= max_width:
+                line_w = candidate
+                line.append(word)
+                i += 1
+                continue
+        elif len(line) <= settled:
+            return line, line_w, y
+        # Quebra (ou fim do texto): a parte só estimada precisa caber de verdade
+        while len(line) > settled:
+            line_w = measure(line)
+            if line_w <= max_width:
+                settled = len(line)
+                break
+            line.pop()
+            i -= 1
+        else:
+            line_w = sum(m.width(w) for w in line) + (m.space * len(line) if trailing_space else 0)
+        if i == len(words):
+            return line, line_w, y
+        lines.append(' '.join(line))
+        widths.append(line_w - m.space if trailing_space and line else line_w)
+        offsets.append(y)
+        y += m.line_height
+        line = [words[i]]
+        line_w = m.width(words[i]) + (m.space if trailing_space else 0)
+        settled = 1
+        i += 1
+
+
+def layout_paragraphs(text, font, wrap_width):
+    """Quebra até wrap_width respeitando '\n', com meia linha entre parágrafos."""
+    m = metrics_for(font)
+    lines, widths, offsets = [], [], []
+    y = 0
+    for paragraph in text.split('\n'):
+        words = [w for w in paragraph.split(' ') if w]
+        line, line_w, y = _break_words(words, m, wrap_width, False, lines, widths, offsets, y)
+        lines.append(' '.join(line))
+        widths.append(line_w)
+        offsets.append(y)
+        y += m.line_height + m.line_height // 2
+    return TextLayout(lines, widths, offsets, m.line_height)
+
+
+def layout_words(text, font, max_width):
+    """Quebra até max_width tratando qualquer espaço em branco como separador."""
+    m = metrics_for(font)
+    lines, widths, offsets = [], [], []
+    line, line_w, y = _break_words(text.split(), m, max_width, True, lines, widths, offsets, 0)
+    if line:
+        lines.append(' '.join(line))
+        widths.append(line_w - m.space)
+        offsets.append(y)
+    return TextLayout(lines, widths, offsets, m.line_height)
+
+
+# Cache compartilhado pelos dois jogos
+TEXT_CACHE = TextCache()
@@ -0,0 +1,57 @@
+import pygame
+
+from ritmo import get_ticks
+
+
+# Curvas de suavização: recebem e devolvem t em [0, 1]
+def linear(t):
+    return t
+
+
+def ease_in_out(t):
+    return t * t * (3 - 2 * t)
+
+
+def ease_out(t):
+    return 1 - (1 - t) ** 3
+
+
+class Transition:
+    """Transição cruzada não bloqueante entre a cena antiga e a nova, dentro do loop principal."""
+    def __init__(self, screen, duration=400, easing=ease_in_out):
+        self.screen = screen
+        self.duration = duration
+        self.easing = easing
+        # Superfície preparada uma única vez e reaproveitada em todas as transições
+        self._old = pygame.Surface(screen.get_size()).convert()
+        self.start_time = None
+
+    @property
+    def running(self):
+        return self.start_time is not None
+
+    def start(self, now=None):
+        """Guarda o que está na tela como cena antiga; pode interromper uma transição em curso."""
+        self._old.blit(self.screen, (0, 0))
+        self.start_time = get_ticks() if now is None else now
+
+    def finish(self):
+        self.start_time = None
+
+    def progress(self, now=None):
+        if not self.running:
+            return 1.0
+        now = get_ticks() if now is None else now
+        return min(max((now - self.start_time) / self.duration, 0.0), 1.0)
+
+    def apply(self, now=None):
+        """Cobre a cena nova, já desenhada na tela, com a antiga esmaecendo; devolve se continua."""
+        if not self.running:
+            return False
+        t = self.progress(now)
+        if t >= 1.0:
+            self.finish()
+            return False
+        self._old.set_alpha(round(255 * (1 - self.easing(t))))
+        self.screen.blit(self._old, (0, 0))
+        return True
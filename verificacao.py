@@ -0,0 +1,206 @@
+"""Conferências de equivalência: cada caminho otimizado contra a versão de referência.
+
+As referências são as implementações originais, simples e lentas, mantidas
+aqui só para a comparação. Cada conferência devolve a lista de divergências
+(vazia quando tudo bate), ou None quando não pode rodar aqui (NumPy ausente);
+o código de saída é 1 se alguma divergiu.
+
+Uso:
+    python verificacao.py                         # todas as conferências
+    python verificacao.py --filtro texto --sorteados 2000
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+CHECKS = []
+
+# Divergências listadas por conferência; o total sempre aparece
+SHOWN = 5
+
+
+def check(name):
+    """Registra fn(ctx) -> lista de divergências (texto descrevendo cada uma) ou None se pulada."""
+    def register(fn):
+        CHECKS.append((name, fn))
+        return fn
+    return register
+
+
+class Context:
+    def __init__(self, samples, seed):
+        from avaliacoes import DEFINITIONS_PATH, load_definitions
+        pygame.font.init()
+        self.defs = load_definitions()
+        # O JSON cru: as referências não passam pelas tabelas compiladas
+        with open(DEFINITIONS_PATH, encoding='utf-8') as f:
+            self.raw = json.load(f)
+        self.samples = samples
+        self.seed = seed
+
+
+# --- texto ---
+
+# Fontes dos jogos, inclusive o negrito sintético, onde a soma das palavras mais erra
+WRAP_FONTS = (('Arial', 22, False), ('Arial', 30, True), ('Arial', 36, True))
+WRAP_WIDTHS = (700, 594, 500, 350, 120)
+
+
+def reference_paragraphs(text, font, wrap_width):
+    """Laço original do parte2: mede a linha inteira a cada palavra."""
+    lines = []
+    for paragraph in text.split('\n'):
+        line = ''
+        for word in paragraph.split(' '):
+            test = f"{line} {word}".strip()
+            if font.size(test)[0] <= wrap_width:
+                line = test
+            else:
+                lines.append(line)
+                line = word
+        lines.append(line)
+    return lines
+
+
+def reference_words(text, font, max_width):
+    """Laço original das pedras: o espaço final conta na medida."""
+    lines = []
+    line = ''
+    for word in text.split():
+        test_line = line + word + ' '
+        if font.size(test_line)[0] > max_width:
+            lines.append(line.strip())
+            line = word + ' '
+        else:
+            line = test_line
+    if line:
+        lines.append(line.strip())
+    return lines
+
+
+def wrap_texts(ctx):
+    """Todos os textos das definições e frases sorteadas com as mesmas palavras."""
+    defs = ctx.defs
+    texts = [q for a in defs.assessments for q in a.questions]
+    texts += [r for a in defs.assessments for r in a.recommendations.values()]
+    texts += list(defs.stones.questions) + list(defs.stones.tips)
+    words = [w for t in texts for w in t.split()]
+    rng = random.Random(ctx.seed)
+    texts += [' '.join(rng.choice(words) for _ in range(rng.randrange(1, 60))) for _ in range(ctx.samples // 10)]
+    return texts
+
+
+def _compare_wrap(ctx, layout, reference):
+    from recursos import FONTS
+    problems = []
+    texts = wrap_texts(ctx)
+    for spec in WRAP_FONTS:
+        font = FONTS.get(*spec)
+        for width in WRAP_WIDTHS:
+            for text in texts:
+                if layout(text, font, width).lines != reference(text, font, width):
+                    problems.append(f"{spec} largura {width}: {text[:50]!r}")
+    return problems
+
+
+@check('texto/quebra_parte2')
+def _(ctx):
+    from texto import layout_paragraphs
+    return _compare_wrap(ctx, layout_paragraphs, reference_paragraphs)
+
+
+@check('texto/quebra_pedras')
+def _(ctx):
+    from texto import layout_words
+    return _compare_wrap(ctx, layout_words, reference_words)
+
+
+# --- pontuação ---
+
+def reference_category(score, categories, default):
+    """Faixas do JSON na ordem listada, a primeira que contém a pontuação."""
+    for name, low, high in categories:
+        if low <= score <= high:
+            return name
+    return default
+
+
+@check('pontuacao/avaliacoes')
+def _(ctx):
+    """Todas as combinações de respostas: lote, Assessment.categorize e as faixas do JSON."""
+    import pontuacao
+    if pontuacao.np is None:
+        return None
+    problems = []
+    for assessment, raw in zip(ctx.defs.assessments, ctx.raw['assessments']):
+        paths = list(itertools.product(range(assessment.option_values), repeat=len(assessment.questions)))
+        totals, names = pontuacao.score_assessments(paths, assessment)
+        for path, total, name in zip(paths, totals.tolist(), names.tolist()):
+            expected = reference_category(sum(path), raw['categories'], ctx.raw['default_category'])
+            if total != sum(path) or name != expected or assessment.categorize(total) != expected:
+                problems.append(f"{assessment.title} {path}: {total} {name}, esperado {expected}")
+    return problems
+
+
+@check('pontuacao/pedras')
+def _(ctx):
+    """Sessões sorteadas: lote, StoneTest.feedback e a regra do JSON."""
+    import pontuacao
+    if pontuacao.np is None:
+        return None
+    stones = ctx.defs.stones
+    rng = random.Random(ctx.seed)
+    options = range(len(stones.options))
+    sessions = []
+    for _ in range(ctx.samples * 10):
+        # Pesos por sessão: as médias se espalham dos dois lados do limiar
+        weights = [rng.random() for _ in options]
+        sessions.append(rng.choices(options, weights, k=len(stones.questions)))
+    averages, labels = pontuacao.score_stones(sessions, stones)
+    raw = ctx.raw['stones']
+    problems = []
+    for answers, avg, label in zip(sessions, averages.tolist(), labels.tolist()):
+        expected = sum(raw['scores'][a] for a in answers) / len(raw['questions'])
+        expected_label = "Preocupante" if expected >= raw['threshold'] else "Não preocupante"
+        if (avg, label) != (expected, expected_label) or stones.feedback(answers) != expected_label:
+            problems.append(f"{answers}: {avg} {label}, esperado {expected} {expected_label}")
+    if len(set(labels.tolist())) < 2:
+        problems.append("o sorteio não chegou aos dois resultados")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Confere os caminhos otimizados contra as referências.")
+    parser.add_argument('--filtro', help="só conferências cujo nome contém este texto")
+    parser.add_argument('--sorteados', type=int, default=1000, help="casos sorteados por conferência")
+    parser.add_argument('--semente', type=int, default=0, help="semente do sorteio")
+    args = parser.parse_args(argv)
+
+    ctx = Context(args.sorteados, args.semente)
+    failed = 0
+    for name, fn in CHECKS:
+        if args.filtro and args.filtro not in name:
+            continue
+        start = time.perf_counter()
+        problems = fn(ctx)
+        elapsed = time.perf_counter() - start
+        if problems is None:
+            print(f"{name:<28}pulada")
+            continue
+        print(f"{name:<28}{'ok' if not problems else f'{len(problems)} divergência(s)':<20}{elapsed:>7.1f} s")
+        for problem in problems[:SHOWN]:
+            print(f"  {problem}")
+        failed += bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())